@@ -1,7 +1,4 @@
 from cgpt.cli import main as main
-from cgpt.commands.init_doctor import (
-    _doctor_parse_major_version as _doctor_parse_major_version,
-)
 from cgpt.core.constants import __version__ as __version__
 from cgpt.domain import conversations as _conversations
 
@@ -17,7 +14,20 @@ __all__ = [
     "main",
 ]
 
+def __getattr__(name):
+    # `doctor` helpers load subprocess/dataclasses; import them only when asked.
+    if name == "_doctor_parse_major_version":
+        from cgpt.commands.init_doctor import _doctor_parse_major_version
+
+        return _doctor_parse_major_version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def find_conversations_json(root):
-    _conversations.JSON_DISCOVERY_BUCKET_LIMIT = JSON_DISCOVERY_BUCKET_LIMIT
-    _conversations.load_json_loose = load_json_loose
+    # Forward overrides of the package-level names (tests and legacy callers set
+    # `cgpt.JSON_DISCOVERY_BUCKET_LIMIT` / `cgpt.load_json_loose`); skip the
+    # writes when the domain module already has the same objects.
+    if _conversations.JSON_DISCOVERY_BUCKET_LIMIT is not JSON_DISCOVERY_BUCKET_LIMIT:
+        _conversations.JSON_DISCOVERY_BUCKET_LIMIT = JSON_DISCOVERY_BUCKET_LIMIT
+    if _conversations.load_json_loose is not load_json_loose:
+        _conversations.load_json_loose = load_json_loose
     return _conversations.find_conversations_json(root)
@@ -1,57 +1,57 @@
+import argparse
 import os
-from contextlib import suppress
+import sys
+from typing import Dict, Optional
 
-from cgpt.cli.parser import build_parser
-from cgpt.commands.extract_index import cmd_extract
+from cgpt.cli.parser import build_parser, cmd_extract, requested_command
 from cgpt.core.color import set_cli_color_override
 from cgpt.core.env import _parse_env_bool
 from cgpt.core.layout import ensure_layout, home_dir
 from cgpt.core.project import resolve_project_name
 
-# Enable line-editing for interactive `input()` (arrow keys, history, tab completion).
-# On macOS this typically wraps libedit; ignore failures if module/bindings differ.
-with suppress(Exception):
-    import readline  # noqa: F401
+_PARSERS: Dict[Optional[str], argparse.ArgumentParser] = {}
 
-    with suppress(Exception):
-        readline.parse_and_bind("tab: complete")
+
+def _get_parser(only: Optional[str] = None) -> argparse.ArgumentParser:
+    """Build the CLI parser once per process and reuse it for later `main()` calls."""
+    parser = _PARSERS.get(only)
+    if parser is None:
+        parser = _PARSERS[only] = build_parser(only)
+    return parser
 
 
 def main() -> None:
-    args = build_parser().parse_args()
+    # Register only the subcommand being run; help and errors get the full parser.
+    # Building and parsing one subcommand takes under a millisecond, so there is
+    # deliberately no hand-rolled fast path that could drift from argparse.
+    args = _get_parser(requested_command(sys.argv[1:])).parse_args()
+
+    # Top-level options (color, no_color, home, quiet, default_mode, cmd) always
+    # carry their parser defaults, so they are read directly below.
 
     # Honor CLI color flags (override env and auto-detect). Must set before any coloring.
-    if getattr(args, "color", False):
+    if args.color:
         set_cli_color_override(True)
-    elif getattr(args, "no_color", False):
+    elif args.no_color:
         set_cli_color_override(False)
 
     # Default behavior: if no subcommand provided, extract newest ZIP in `zips/`.
-    if not getattr(args, "cmd", None):
-        # Ensure args has a `zip` attribute for cmd_extract (it expects args.zip)
-        if not hasattr(args, "zip"):
-            args.zip = None
-        # Respect global quiet flag when default-extract
-        if getattr(args, "quiet", False):
-            args.quiet = True
+    if not args.cmd:
+        # No subcommand means no `zip` positional; cmd_extract expects args.zip.
+        args.zip = None
         cmd_extract(args)
         return
 
-    # Resolve global/default mode preference: CLI > env CGPT_DEFAULT_MODE > builtin 'full'
-    effective_default_mode = None
-    if getattr(args, "default_mode", None):
-        effective_default_mode = args.default_mode
-    else:
-        env_mode = os.environ.get("CGPT_DEFAULT_MODE")
-        if env_mode and env_mode.lower() in ("full", "excerpts"):
-            effective_default_mode = env_mode.lower()
-    if effective_default_mode is None:
-        effective_default_mode = "full"
-
     # If the chosen subcommand has a `mode` attribute that wasn't explicitly provided
-    # (we set subparser defaults to None), fill it from the effective default.
+    # (we set subparser defaults to None), fill it from the global preference:
+    # --default-mode > env CGPT_DEFAULT_MODE > builtin 'full'. The env is only
+    # read when a mode is actually needed.
     if hasattr(args, "mode") and args.mode is None:
-        args.mode = effective_default_mode
+        mode = args.default_mode
+        if not mode:
+            env_mode = (os.environ.get("CGPT_DEFAULT_MODE") or "").lower()
+            mode = env_mode if env_mode in ("full", "excerpts") else "full"
+        args.mode = mode
 
     # Resolve split default from env when subcommand supports split and CLI did not set it.
     # Priority: CLI --split/--no-split > CGPT_DEFAULT_SPLIT > builtin False.
@@ -61,8 +61,8 @@ def main() -> None:
 
     # Resolve project name: explicit --name wins; otherwise use active project if available.
     if hasattr(args, "name"):
-        home = home_dir(getattr(args, "home", None))
+        home = home_dir(args.home)
         _, _, dossiers_dir = ensure_layout(home)
-        args.name = resolve_project_name(dossiers_dir, getattr(args, "name", None))
+        args.name = resolve_project_name(dossiers_dir, args.name)
 
     args.func(args)
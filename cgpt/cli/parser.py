@@ -1,25 +1,44 @@
 import argparse
+import importlib
+from typing import Callable, Dict, Optional, Sequence, Tuple
 
-from cgpt.commands.discovery import cmd_find, cmd_ids, cmd_search
-from cgpt.commands.dossier import (
-    cmd_build_dossier,
-    cmd_make_dossiers,
-    cmd_quick,
-    cmd_recent,
-)
-from cgpt.commands.extract_index import cmd_extract, cmd_index, cmd_latest_zip
-from cgpt.commands.init_doctor import cmd_doctor, cmd_init
-from cgpt.commands.project import (
-    cmd_project_clear,
-    cmd_project_init,
-    cmd_project_list,
-    cmd_project_status,
-    cmd_project_use,
-)
 from cgpt.core.constants import __version__
 from cgpt.core.io import parse_context
 
 
+def _lazy(module: str, name: str) -> Callable[[argparse.Namespace], None]:
+    """Return a handler that imports `module` and runs its `name` when called.
+
+    Command modules pull in SQLite, ZIP, and dossier code; loading them only
+    for the subcommand that runs keeps that out of `--help`/`--version` and
+    every other command's startup.
+    """
+
+    def run(args: argparse.Namespace) -> None:
+        getattr(importlib.import_module(module), name)(args)
+
+    return run
+
+
+cmd_find = _lazy("cgpt.commands.discovery", "cmd_find")
+cmd_ids = _lazy("cgpt.commands.discovery", "cmd_ids")
+cmd_search = _lazy("cgpt.commands.discovery", "cmd_search")
+cmd_build_dossier = _lazy("cgpt.commands.dossier", "cmd_build_dossier")
+cmd_make_dossiers = _lazy("cgpt.commands.dossier", "cmd_make_dossiers")
+cmd_quick = _lazy("cgpt.commands.dossier", "cmd_quick")
+cmd_recent = _lazy("cgpt.commands.dossier", "cmd_recent")
+cmd_extract = _lazy("cgpt.commands.extract_index", "cmd_extract")
+cmd_index = _lazy("cgpt.commands.extract_index", "cmd_index")
+cmd_latest_zip = _lazy("cgpt.commands.extract_index", "cmd_latest_zip")
+cmd_doctor = _lazy("cgpt.commands.init_doctor", "cmd_doctor")
+cmd_init = _lazy("cgpt.commands.init_doctor", "cmd_init")
+cmd_project_clear = _lazy("cgpt.commands.project", "cmd_project_clear")
+cmd_project_init = _lazy("cgpt.commands.project", "cmd_project_init")
+cmd_project_list = _lazy("cgpt.commands.project", "cmd_project_list")
+cmd_project_status = _lazy("cgpt.commands.project", "cmd_project_status")
+cmd_project_use = _lazy("cgpt.commands.project", "cmd_project_use")
+
+
 def _add_split_flags(parser: argparse.ArgumentParser, split_help: str) -> None:
     """Add --split/--no-split flags with tri-state default for env fallback."""
     grp = parser.add_mutually_exclusive_group()
@@ -38,6 +57,38 @@ def _add_split_flags(parser: argparse.ArgumentParser, split_help: str) -> None:
     )
 
 
+def _add_dossier_output_flags(parser: argparse.ArgumentParser) -> None:
+    """Add the working-output and project flags shared by dossier commands."""
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        default=True,
+        help="Enable deduplication in working output (default: True)",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        dest="dedup",
+        action="store_false",
+        help="Disable deduplication in working output",
+    )
+    parser.add_argument(
+        "--patterns-file",
+        help="Path to file with deliverable patterns (one per line). Default patterns: ##, Constraint, Draft, Decision, Output, Result",
+    )
+    parser.add_argument(
+        "--used-links-file",
+        help="Path to file with URLs already used in drafts (one per line). These will be prioritized in source lists.",
+    )
+    parser.add_argument(
+        "--config",
+        help="Path to column config file (JSON) for segment filtering and control layer generation",
+    )
+    parser.add_argument(
+        "--name",
+        help="Project name for organizing output. Creates dossiers/{name}/ subfolder.",
+    )
+
+
 def _configure_build_dossier_parser(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--topic", help="Single topic keyword (for excerpts mode)")
     parser.add_argument(
@@ -74,34 +125,7 @@ def _configure_build_dossier_parser(parser: argparse.ArgumentParser) -> None:
         parser,
         "Generate two TXT files: dossier_raw.txt (full) and dossier_raw__working.txt (cleaned, deduplicated, deliverables-only).",
     )
-    parser.add_argument(
-        "--dedup",
-        action="store_true",
-        default=True,
-        help="Enable deduplication in working output (default: True)",
-    )
-    parser.add_argument(
-        "--no-dedup",
-        dest="dedup",
-        action="store_false",
-        help="Disable deduplication in working output",
-    )
-    parser.add_argument(
-        "--patterns-file",
-        help="Path to file with deliverable patterns (one per line). Default patterns: ##, Constraint, Draft, Decision, Output, Result",
-    )
-    parser.add_argument(
-        "--used-links-file",
-        help="Path to file with URLs already used in drafts (one per line). These will be prioritized in source lists.",
-    )
-    parser.add_argument(
-        "--config",
-        help="Path to column config file (JSON) for segment filtering and control layer generation",
-    )
-    parser.add_argument(
-        "--name",
-        help="Project name for organizing output. Creates dossiers/{name}/ subfolder.",
-    )
+    _add_dossier_output_flags(parser)
     parser.set_defaults(func=cmd_build_dossier)
 
 
@@ -160,34 +184,7 @@ def _configure_quick_parser(parser: argparse.ArgumentParser) -> None:
         parser,
         "Generate two TXT files: dossier_raw.txt (full) and dossier_raw__working.txt (cleaned, deduplicated, deliverables-only).",
     )
-    parser.add_argument(
-        "--dedup",
-        action="store_true",
-        default=True,
-        help="Enable deduplication in working output (default: True)",
-    )
-    parser.add_argument(
-        "--no-dedup",
-        dest="dedup",
-        action="store_false",
-        help="Disable deduplication in working output",
-    )
-    parser.add_argument(
-        "--patterns-file",
-        help="Path to file with deliverable patterns (one per line). Default patterns: ##, Constraint, Draft, Decision, Output, Result",
-    )
-    parser.add_argument(
-        "--used-links-file",
-        help="Path to file with URLs already used in drafts (one per line).",
-    )
-    parser.add_argument(
-        "--config",
-        help="Path to column config file (JSON) for segment filtering and control layer generation",
-    )
-    parser.add_argument(
-        "--name",
-        help="Project name for organizing output. Creates dossiers/{name}/ subfolder.",
-    )
+    _add_dossier_output_flags(parser)
     parser.set_defaults(func=cmd_quick)
 
 
@@ -211,85 +208,18 @@ def _configure_recent_parser(parser: argparse.ArgumentParser) -> None:
         help="Output format(s) for dossier (default: txt)",
     )
     _add_split_flags(parser, "Generate both raw and working TXT files.")
-    parser.add_argument(
-        "--dedup",
-        action="store_true",
-        default=True,
-        help="Enable deduplication in working output (default: True)",
-    )
-    parser.add_argument(
-        "--no-dedup",
-        dest="dedup",
-        action="store_false",
-        help="Disable deduplication in working output",
-    )
-    parser.add_argument(
-        "--patterns-file",
-        help="Path to file with deliverable patterns (one per line)",
-    )
-    parser.add_argument(
-        "--used-links-file",
-        help="Path to file with URLs already used in drafts (one per line)",
-    )
-    parser.add_argument(
-        "--config",
-        help="Path to column config file (JSON)",
-    )
-    parser.add_argument(
-        "--name",
-        help="Project name for organizing output. Creates dossiers/{name}/ subfolder.",
-    )
+    _add_dossier_output_flags(parser)
     parser.add_argument("--mode", choices=["full", "excerpts"], default=None)
     parser.add_argument("--context", type=parse_context, default=2)
     parser.set_defaults(func=cmd_recent)
 
 
-def build_parser() -> argparse.ArgumentParser:
-    p = argparse.ArgumentParser(
-        prog="cgpt",
-        description="ChatGPT export helper (zips → extracted → dossiers).",
-    )
-    p.add_argument(
-        "--version", action="version", version=f"%(prog)s {__version__}"
-    )
-    # CLI-level color control: --color / --no-color
-    color_grp = p.add_mutually_exclusive_group()
-    color_grp.add_argument(
-        "--color", dest="color", action="store_true", help="Force-enable ANSI colors"
-    )
-    color_grp.add_argument(
-        "--no-color",
-        dest="no_color",
-        action="store_true",
-        help="Force-disable ANSI colors",
-    )
-    p.add_argument(
-        "--home",
-        help="Home folder containing zips/, extracted/, dossiers/. Default: $CGPT_HOME, auto-detected, or CWD",
-    )
-    p.add_argument(
-        "--quiet",
-        dest="quiet",
-        action="store_true",
-        help="Suppress non-error output (useful in scripts)",
-    )
-    p.add_argument(
-        "--default-mode",
-        dest="default_mode",
-        choices=["full", "excerpts"],
-        default=None,
-        help="Set preferred default mode for dossier creation (overrides CGPT_DEFAULT_MODE)",
-    )
-    # If no subcommand is provided, we'll default to extracting the newest ZIP.
-    sub = p.add_subparsers(dest="cmd", required=False)
+def _configure_init_parser(parser: argparse.ArgumentParser) -> None:
+    parser.set_defaults(func=cmd_init)
 
-    a = sub.add_parser(
-        "init", help="Create/verify required folders: zips/, extracted/, dossiers/"
-    )
-    a.set_defaults(func=cmd_init)
 
-    a = sub.add_parser("project", help="Manage active research project context")
-    project_sub = a.add_subparsers(dest="project_cmd", required=True)
+def _configure_project_parser(parser: argparse.ArgumentParser) -> None:
+    project_sub = parser.add_subparsers(dest="project_cmd", required=True)
 
     p_init = project_sub.add_parser(
         "init", help="Create project folder under dossiers/ and set as active"
@@ -319,162 +249,123 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_clear.set_defaults(func=cmd_project_clear)
 
-    a = sub.add_parser(
-        "doctor",
-        help="Validate runtime/developer environment and folder layout",
-    )
-    a.add_argument(
+
+def _configure_doctor_parser(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
         "--fix",
         action="store_true",
         help="Create missing home folders if possible",
     )
-    a.add_argument(
+    parser.add_argument(
         "--dev",
         action="store_true",
         help="Include contributor tooling checks (ruff/node/npx/tox/interpreters)",
     )
-    a.add_argument(
+    parser.add_argument(
         "--strict",
         action="store_true",
         help="Treat warnings as failures (exit code 2)",
     )
-    a.set_defaults(func=cmd_doctor)
+    parser.set_defaults(func=cmd_doctor)
 
-    a = sub.add_parser("latest-zip", help="Print newest ZIP in zips/")
-    a.set_defaults(func=cmd_latest_zip)
 
-    a = sub.add_parser(
-        "extract",
-        help="Extract a ZIP into extracted/<zip_stem>/ (defaults to newest ZIP)",
-    )
-    a.add_argument("zip", nargs="?", help="Path to ZIP (optional)")
-    a.add_argument(
+def _configure_latest_zip_parser(parser: argparse.ArgumentParser) -> None:
+    parser.set_defaults(func=cmd_latest_zip)
+
+
+def _configure_extract_parser(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("zip", nargs="?", help="Path to ZIP (optional)")
+    parser.add_argument(
         "--no-index",
         dest="no_index",
         action="store_true",
         help="Do not update the search index after extracting",
     )
-    a.add_argument(
+    parser.add_argument(
         "--reindex",
         dest="reindex",
         action="store_true",
         help="Force rebuild of the search index after extracting",
     )
-    a.set_defaults(func=cmd_extract)
+    parser.set_defaults(func=cmd_extract)
 
-    a = sub.add_parser(
-        "index",
-        help="(Re)build the search index from an extracted export (uses FTS5 when available)",
-    )
-    a.add_argument(
+
+def _configure_index_parser(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
         "--root", help="Extracted folder to scan (defaults to extracted/latest)"
     )
-    a.add_argument(
+    parser.add_argument(
         "--reindex",
         dest="reindex",
         action="store_true",
         help="Force rebuild of the search index",
     )
-    a.add_argument(
+    parser.add_argument(
         "--db",
         dest="db",
         help="Path to index DB file (defaults to extracted/cgpt_index.db)",
     )
-    a.set_defaults(func=cmd_index)
+    parser.set_defaults(func=cmd_index)
 
-    # Short alias
-    a = sub.add_parser("x", help="Alias for extract")
-    a.add_argument("zip", nargs="?", help="Path to ZIP (optional)")
-    a.add_argument(
-        "--no-index",
-        dest="no_index",
-        action="store_true",
-        help="Do not update the search index after extracting",
-    )
-    a.add_argument(
-        "--reindex",
-        dest="reindex",
-        action="store_true",
-        help="Force rebuild of the search index after extracting",
-    )
-    a.set_defaults(func=cmd_extract)
 
-    a = sub.add_parser("ids", help="Print id<TAB>title for all conversations")
-    a.add_argument(
+def _configure_ids_parser(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
         "--root", help="Extracted folder to scan (defaults to extracted/latest)"
     )
-    a.set_defaults(func=cmd_ids)
+    parser.set_defaults(func=cmd_ids)
 
-    # Short alias
-    a = sub.add_parser("i", help="Alias for ids")
-    a.add_argument(
-        "--root", help="Extracted folder to scan (defaults to extracted/latest)"
-    )
-    a.set_defaults(func=cmd_ids)
 
-    a = sub.add_parser(
-        "find", help="Find conversations whose titles match query (case-insensitive)"
-    )
-    a.add_argument("query")
-    a.add_argument(
+def _configure_find_parser(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("query")
+    parser.add_argument(
         "--root", help="Extracted folder to scan (defaults to extracted/latest)"
     )
-    a.set_defaults(func=cmd_find)
+    parser.set_defaults(func=cmd_find)
 
-    # Short alias
-    a = sub.add_parser("f", help="Alias for find")
-    a.add_argument("query")
-    a.add_argument(
-        "--root", help="Extracted folder to scan (defaults to extracted/latest)"
-    )
-    a.set_defaults(func=cmd_find)
 
-    a = sub.add_parser(
-        "search", help="Search in titles and/or message text (case-insensitive)"
-    )
-    a.add_argument("query", nargs="?", default=None)
-    a.add_argument(
+def _configure_search_parser(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("query", nargs="?", default=None)
+    parser.add_argument(
         "where",
         nargs="?",
         choices=["title", "messages", "all"],
         help="Optional positional: where to search (title|messages|all)",
     )
-    a.add_argument(
+    parser.add_argument(
         "--terms",
         nargs="+",
         help="One or more search terms (use with --and to require all)",
     )
-    a.add_argument(
+    parser.add_argument(
         "--and",
         dest="and_terms",
         action="store_true",
         help="Require ALL terms to match (default is OR)",
     )
-    a.add_argument(
+    parser.add_argument(
         "--where",
         dest="where_opt",
         choices=["title", "messages", "all"],
         default=None,
         help="Where to search: title (default), messages, or all",
     )
-    a.add_argument(
+    parser.add_argument(
         "--root", help="Extracted folder to scan (defaults to extracted/latest)"
     )
-    a.set_defaults(func=cmd_search)
+    parser.set_defaults(func=cmd_search)
 
-    a = sub.add_parser(
-        "make-dossiers", help="Write one or more formats per selected conversation ID"
-    )
-    a.add_argument(
+
+def _configure_make_dossiers_parser(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
         "--root", help="Extracted folder to scan (defaults to extracted/latest)"
     )
-    a.add_argument("--ids-file", help="Text file with one id per line")
-    a.add_argument("--ids", nargs="*", help="One or more IDs")
-    a.add_argument(
+    parser.add_argument("--ids-file", help="Text file with one id per line")
+    parser.add_argument("--ids", nargs="*", help="One or more IDs")
+    parser.add_argument(
         "--name",
         help="Project name for organizing output. Creates dossiers/{name}/ subfolder.",
     )
-    a.add_argument(
+    parser.add_argument(
         "--format",
         nargs="+",
         choices=["txt", "md", "docx"],
@@ -486,30 +377,139 @@ def build_parser() -> argparse.ArgumentParser:
             "--format txt md docx  # produce all three"
         ),
     )
-    a.set_defaults(func=cmd_make_dossiers)
-
-    for cmd_name, cmd_help in (
-        ("build-dossier", "Build a single combined dossier with time + branch nesting"),
-        ("d", "Alias for build-dossier"),
-    ):
-        a = sub.add_parser(cmd_name, help=cmd_help)
-        _configure_build_dossier_parser(a)
+    parser.set_defaults(func=cmd_make_dossiers)
+
+
+# Subcommand name -> (help, configure), in `--help` order. Aliases share the
+# configure function of the command they stand for.
+_SUBCOMMANDS: Dict[str, Tuple[str, Callable[[argparse.ArgumentParser], None]]] = {
+    "init": (
+        "Create/verify required folders: zips/, extracted/, dossiers/",
+        _configure_init_parser,
+    ),
+    "project": ("Manage active research project context", _configure_project_parser),
+    "doctor": (
+        "Validate runtime/developer environment and folder layout",
+        _configure_doctor_parser,
+    ),
+    "latest-zip": ("Print newest ZIP in zips/", _configure_latest_zip_parser),
+    "extract": (
+        "Extract a ZIP into extracted/<zip_stem>/ (defaults to newest ZIP)",
+        _configure_extract_parser,
+    ),
+    "index": (
+        "(Re)build the search index from an extracted export (uses FTS5 when available)",
+        _configure_index_parser,
+    ),
+    "x": ("Alias for extract", _configure_extract_parser),
+    "ids": ("Print id<TAB>title for all conversations", _configure_ids_parser),
+    "i": ("Alias for ids", _configure_ids_parser),
+    "find": (
+        "Find conversations whose titles match query (case-insensitive)",
+        _configure_find_parser,
+    ),
+    "f": ("Alias for find", _configure_find_parser),
+    "search": (
+        "Search in titles and/or message text (case-insensitive)",
+        _configure_search_parser,
+    ),
+    "make-dossiers": (
+        "Write one or more formats per selected conversation ID",
+        _configure_make_dossiers_parser,
+    ),
+    "build-dossier": (
+        "Build a single combined dossier with time + branch nesting",
+        _configure_build_dossier_parser,
+    ),
+    "d": ("Alias for build-dossier", _configure_build_dossier_parser),
+    "quick": (
+        "Extract (if needed) → find by title → pick IDs → build dossier",
+        _configure_quick_parser,
+    ),
+    "q": ("Alias for quick", _configure_quick_parser),
+    "recent": (
+        "Show the N most recent conversations and select interactively",
+        _configure_recent_parser,
+    ),
+    "r": ("Alias for recent", _configure_recent_parser),
+}
+
+# Top-level options that consume the following token as their value; keep in
+# sync with the value-taking options added in `build_parser`.
+_GLOBAL_VALUE_OPTIONS = ("--home", "--default-mode")
+
+
+def requested_command(argv: Sequence[str]) -> Optional[str]:
+    """Return the subcommand named in `argv`, or None when all must be registered.
+
+    Skips top-level options (and the values of those that take one, including
+    argparse's unambiguous prefixes). Help flags before the subcommand, an
+    unknown positional, or no subcommand at all return None, so top-level help
+    and "invalid choice" errors still see every subcommand.
+    """
+    tokens = iter(argv)
+    for token in tokens:
+        if token in ("-h", "--help") or token == "--":
+            return None
+        if token.startswith("-"):
+            if "=" not in token and len(token) > 2 and any(
+                opt.startswith(token) for opt in _GLOBAL_VALUE_OPTIONS
+            ):
+                next(tokens, None)
+            continue
+        return token if token in _SUBCOMMANDS else None
+    return None
+
+
+def build_parser(only: Optional[str] = None) -> argparse.ArgumentParser:
+    """Build the CLI parser; with `only`, register just that subcommand.
+
+    `main()` passes the subcommand from `requested_command`, so a run sets up
+    one subparser instead of all of them.
+    """
+    p = argparse.ArgumentParser(
+        prog="cgpt",
+        description="ChatGPT export helper (zips → extracted → dossiers).",
+    )
+    p.add_argument(
+        "--version", action="version", version=f"%(prog)s {__version__}"
+    )
+    # CLI-level color control: --color / --no-color
+    color_grp = p.add_mutually_exclusive_group()
+    color_grp.add_argument(
+        "--color", dest="color", action="store_true", help="Force-enable ANSI colors"
+    )
+    color_grp.add_argument(
+        "--no-color",
+        dest="no_color",
+        action="store_true",
+        help="Force-disable ANSI colors",
+    )
+    p.add_argument(
+        "--home",
+        help="Home folder containing zips/, extracted/, dossiers/. Default: $CGPT_HOME, auto-detected, or CWD",
+    )
+    p.add_argument(
+        "--quiet",
+        dest="quiet",
+        action="store_true",
+        help="Suppress non-error output (useful in scripts)",
+    )
+    p.add_argument(
+        "--default-mode",
+        dest="default_mode",
+        choices=["full", "excerpts"],
+        default=None,
+        help="Set preferred default mode for dossier creation (overrides CGPT_DEFAULT_MODE)",
+    )
+    # If no subcommand is provided, we'll default to extracting the newest ZIP.
+    sub = p.add_subparsers(dest="cmd", required=False)
 
-    for cmd_name, cmd_help in (
-        (
-            "quick",
-            "Extract (if needed) → find by title → pick IDs → build dossier",
-        ),
-        ("q", "Alias for quick"),
-    ):
-        a = sub.add_parser(cmd_name, help=cmd_help)
-        _configure_quick_parser(a)
-
-    for cmd_name, cmd_help in (
-        ("recent", "Show the N most recent conversations and select interactively"),
-        ("r", "Alias for recent"),
-    ):
-        a = sub.add_parser(cmd_name, help=cmd_help)
-        _configure_recent_parser(a)
+    if only is not None:
+        # Keep the full command list in usage lines printed for parse errors.
+        sub.metavar = "{" + ",".join(_SUBCOMMANDS) + "}"
+    for cmd_name, (cmd_help, configure) in _SUBCOMMANDS.items():
+        if only is None or cmd_name == only:
+            configure(sub.add_parser(cmd_name, help=cmd_help))
 
     return p
@@ -2,18 +2,12 @@ import argparse
 from pathlib import Path
 from typing import List
 
-from cgpt.commands.dossier_roots import resolve_root
-from cgpt.core.color import _colorize_title_with_topic, _colorize_title_with_topics
+from cgpt.commands.dossier_roots import load_conversations, resolve_root
+from cgpt.core.color import compile_title_highlighter
 from cgpt.core.layout import die, ensure_layout, home_dir
 from cgpt.core.project import get_active_project
-from cgpt.domain.conversations import (
-    conv_id_and_title,
-    conversation_messages_blob,
-    find_conversations_json,
-    load_json,
-    normalize_conversations,
-)
-from cgpt.domain.indexing import build_fts_query, index_matches_root, query_index
+from cgpt.domain.conversations import conv_id_and_title, conversation_has_terms
+from cgpt.domain.indexing import index_matches_root, search_index
 
 
 def _resolve_search_root(args: argparse.Namespace) -> Path:
@@ -26,11 +20,7 @@ def _resolve_search_root(args: argparse.Namespace) -> Path:
 
 def cmd_ids(args: argparse.Namespace) -> None:
     root = _resolve_search_root(args)
-    data_file = find_conversations_json(root)
-    if not data_file:
-        die(f"No conversations JSON found under {root}")
-    data = load_json(data_file)
-    convs = normalize_conversations(data)
+    convs = load_conversations(root)
     for c in convs:
         cid, title = conv_id_and_title(c)
         if cid:
@@ -42,15 +32,12 @@ def cmd_find(args: argparse.Namespace) -> None:
     if not query_raw:
         die("Query cannot be empty.")
     root = _resolve_search_root(args)
-    data_file = find_conversations_json(root)
-    if not data_file:
-        die(f"No conversations JSON found under {root}")
-    data = load_json(data_file)
-    convs = normalize_conversations(data)
+    convs = load_conversations(root)
+    highlight = compile_title_highlighter([query_raw])
     for c in convs:
         cid, title = conv_id_and_title(c)
         if cid and q in (title or "").lower():
-            colored = _colorize_title_with_topic(title or "", query_raw)
+            colored = highlight(title or "")
             print(f"{cid}\t{colored}")
 
 def cmd_search(args: argparse.Namespace) -> None:
@@ -72,51 +59,45 @@ def cmd_search(args: argparse.Namespace) -> None:
     _, extracted_dir, _ = ensure_layout(home)
     root = _resolve_search_root(args)
 
+    highlight = compile_title_highlighter(terms)
+
     # Try using SQLite FTS index only when scoped to the same export root.
     db_path = extracted_dir / "cgpt_index.db"
     if db_path.exists() and index_matches_root(db_path, root):
-        fts_q = build_fts_query(terms, and_terms)
-        if fts_q:
-            rows = query_index(db_path, fts_q, where=where)
-            if rows:
-                for cid, title in rows:
-                    colored_title = _colorize_title_with_topics(title or "", terms)
-                    print(f"{cid}\t{colored_title}")
-                return
-
-    data_file = find_conversations_json(root)
-    if not data_file:
-        die(f"No conversations JSON found under {root}")
-    data = load_json(data_file)
-    convs = normalize_conversations(data)
+        rows = search_index(db_path, terms, and_terms, where=where)
+        if rows is not None:
+            for cid, title in rows:
+                colored_title = highlight(title or "")
+                print(f"{cid}\t{colored_title}")
+            return
+
+    if where not in ("title", "messages", "all"):
+        die(f"Invalid --where value: {where}")
+
+    convs = load_conversations(root)
 
     terms_lower = [term.lower() for term in terms]
+    matches = all if and_terms else any
 
     for c in convs:
         cid, title = conv_id_and_title(c)
         if not cid:
             continue
 
-        title_lower = (title or "").lower()
-        messages_lower = ""
-        if where in ("messages", "all"):
-            messages_lower = conversation_messages_blob(c).lower()
-
-        checks: List[bool]
         if where == "title":
-            checks = [term in title_lower for term in terms_lower]
+            title_lower = title.lower()
+            hit = matches(term in title_lower for term in terms_lower)
         elif where == "messages":
-            checks = [term in messages_lower for term in terms_lower]
-        elif where == "all":
-            checks = [
-                (term in title_lower) or (term in messages_lower)
-                for term in terms_lower
-            ]
+            hit = conversation_has_terms(c, terms_lower, require_all=and_terms)
         else:
-            die(f"Invalid --where value: {where}")
-
-        hit = all(checks) if and_terms else any(checks)
+            # Message text is only rendered for the terms the title can't settle.
+            title_lower = title.lower()
+            pending = [term for term in terms_lower if term not in title_lower]
+            if not pending or (not and_terms and len(pending) < len(terms_lower)):
+                hit = True
+            else:
+                hit = conversation_has_terms(c, pending, require_all=and_terms)
 
         if hit:
-            colored_title = _colorize_title_with_topics(title or "", terms)
+            colored_title = highlight(title or "")
             print(f"{cid}\t{colored_title}")
@@ -1,8 +1,10 @@
 import argparse
+import heapq
 import sys
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from cgpt.commands.dossier_options import collect_build_options, collect_wanted_ids
 from cgpt.commands.dossier_roots import (
@@ -11,9 +13,8 @@ from cgpt.commands.dossier_roots import (
     resolve_root,
 )
 from cgpt.commands.dossier_selection import collect_selection_indices, write_ids_tsv
-from cgpt.core.color import _colorize_title_with_topics
+from cgpt.core.color import compile_title_highlighter
 from cgpt.core.io import (
-    coerce_create_time,
     safe_slug,
     ts_to_local_str,
     warn_invalid_create_time,
@@ -22,13 +23,15 @@ from cgpt.core.layout import die, ensure_layout, home_dir
 from cgpt.core.project import project_output_dir
 from cgpt.domain.config_schema import load_column_config
 from cgpt.domain.conversations import (
+    ConversationFields,
     build_conversation_map_by_id,
     conv_id_and_title,
-    conversation_messages_blob,
+    conversation_has_terms,
     extract_messages_best_effort,
 )
 from cgpt.domain.dossier_builder import build_combined_dossier, markdown_to_plain_text
 from cgpt.domain.dossier_cleaning import _extract_sources
+from cgpt.domain.indexing import index_matches_root, search_index
 
 
 def cmd_make_dossiers(args: argparse.Namespace) -> None:
@@ -40,12 +43,29 @@ def cmd_make_dossiers(args: argparse.Namespace) -> None:
     convs = load_conversations(root)
     wanted = collect_wanted_ids(args)
 
-    by_id = build_conversation_map_by_id(convs)
+    by_id = build_conversation_map_by_id(convs, wanted)
 
     missing = [i for i in wanted if i not in by_id]
     if missing:
         die("Some IDs not found in export:\n" + "\n".join(missing))
 
+    # normalize requested formats (default to txt)
+    req_formats = [f.lower() for f in (getattr(args, "format", None) or [])]
+    if not req_formats:
+        req_formats = ["txt"]
+    # Markdown feeds the .md file and the DOCX conversion only.
+    needs_markdown = "md" in req_formats or "docx" in req_formats
+
+    # Resolve python-docx once per run; a failed import is not cached by
+    # Python, so retrying it per conversation would rescan sys.path each time.
+    docx_document: Any = None
+    docx_import_error: Optional[Exception] = None
+    if "docx" in req_formats:
+        try:
+            from docx import Document as docx_document  # type: ignore
+        except Exception as e:
+            docx_import_error = e
+
     for cid in wanted:
         c = by_id[cid]
         _, title = conv_id_and_title(c)
@@ -53,23 +73,22 @@ def cmd_make_dossiers(args: argparse.Namespace) -> None:
         md_path = base.with_suffix(".md")
 
         msgs = extract_messages_best_effort(c)
-        header = f"# {title or 'Untitled'}\n\n- id: {cid}\n"
-        ctime = c.get("create_time")
-        if isinstance(ctime, (int, float)):
-            header += f"- conversation_create_time: {ts_to_local_str(float(ctime))}\n"
-        header += "\n---\n\n"
-
-        parts = [header]
-        for m in msgs:
-            role_name = m.role.capitalize()
-            parts.append(f"## {role_name} ({ts_to_local_str(m.t)})\n\n{m.text}\n\n")
-
-        md_content = "".join(parts)
+        md_content = ""
+        if needs_markdown:
+            header = f"# {title or 'Untitled'}\n\n- id: {cid}\n"
+            ctime = c.get("create_time")
+            if isinstance(ctime, (int, float)):
+                header += (
+                    f"- conversation_create_time: {ts_to_local_str(float(ctime))}\n"
+                )
+            header += "\n---\n\n"
 
-        # normalize requested formats (default to txt)
-        req_formats = [f.lower() for f in (getattr(args, "format", None) or [])]
-        if not req_formats:
-            req_formats = ["txt"]
+            md_content = header + "".join(
+                [
+                    f"## {m.role.capitalize()} ({ts_to_local_str(m.t)})\n\n{m.text}\n\n"
+                    for m in msgs
+                ]
+            )
 
         created_paths: List[Path] = []
 
@@ -93,29 +112,24 @@ def cmd_make_dossiers(args: argparse.Namespace) -> None:
                 )
                 clean_txt_lines.append(f"Source: {root}\n\n")
 
-                # Extract sources from this conversation
-                sources: List[Tuple[str, str]] = []
-                for msg in msgs:
-                    sources.extend(_extract_sources(msg.text))
-
                 # Main content
                 clean_txt_lines.append("=" * 70 + "\n")
                 for msg in msgs:
                     role = msg.role.capitalize()
                     clean_txt_lines.append(f"{role}:\n\n{msg.text}\n\n")
 
+                # Sources from one scan; a URL never spans the "\n" joints
+                sources: Dict[str, str] = dict(
+                    _extract_sources("\n".join(msg.text for msg in msgs))
+                )
+
                 # Sources registry
                 if sources:
-                    sources_dict: Dict[str, str] = {}
-                    for url, label in sources:
-                        if url not in sources_dict:
-                            sources_dict[url] = label
-
                     clean_txt_lines.append("\n" + "=" * 70 + "\n")
                     clean_txt_lines.append("SOURCES REGISTRY\n")
                     clean_txt_lines.append("=" * 70 + "\n\n")
                     for i, (url, label) in enumerate(
-                        sorted(sources_dict.items()), start=1
+                        sorted(sources.items()), start=1
                     ):
                         clean_txt_lines.append(f"[{i}] {label}\n    {url}\n\n")
 
@@ -130,10 +144,11 @@ def cmd_make_dossiers(args: argparse.Namespace) -> None:
 
         if "docx" in req_formats:
             try:
-                from docx import Document  # type: ignore
+                if docx_import_error is not None:
+                    raise docx_import_error
 
                 docx_path = base.with_suffix(".docx")
-                docx_doc = Document()
+                docx_doc = docx_document()
                 plain = markdown_to_plain_text(md_content)
                 for para in [p for p in plain.split("\n\n") if p.strip()]:
                     docx_doc.add_paragraph(para)
@@ -148,14 +163,11 @@ def cmd_make_dossiers(args: argparse.Namespace) -> None:
         # Print whichever primary file was created (prefer txt then md then docx)
         if created_paths:
             # choose preferred ordering
+            by_suffix = {p.suffix: p for p in created_paths}
             for ext in (".txt", ".md", ".docx"):
-                for p in created_paths:
-                    if p.suffix == ext:
-                        print(p)
-                        break
-                else:
-                    continue
-                break
+                if ext in by_suffix:
+                    print(by_suffix[ext])
+                    break
         else:
             print(
                 f"WARNING: No output files created for conversation {cid}",
@@ -227,28 +239,24 @@ def cmd_recent(args: argparse.Namespace) -> None:
     selected_output_dir = project_output_dir(dossiers_dir, project_name)
     convs = load_conversations(root)
 
-    # Sort by create_time descending (newest first), then take top N
+    # Build the selection rows (id, title, create_time) in one pass; the
+    # dossier build reuses the derived fields for the picked conversations.
+    fields = ConversationFields()
     invalid_create_time = [0]
-    convs_with_time: List[Tuple[Any, float]] = []
+    matches: List[Tuple[str, str, float]] = []
     for c in convs:
-        cid, title = conv_id_and_title(c)
+        cid, title = fields.meta(c)
         if cid:
-            ctime = coerce_create_time(c.get("create_time"), invalid_create_time)
-            convs_with_time.append((c, ctime))
+            ctime = fields.ctime(c, invalid_create_time)
+            matches.append((cid, title or "", ctime))
 
-    convs_with_time.sort(key=lambda x: x[1], reverse=True)
-    recent_convs = convs_with_time[:count]
+    # Newest N first; nlargest matches a stable reverse sort, in O(n log N)
+    matches = heapq.nlargest(count, matches, key=itemgetter(2))
     warn_invalid_create_time(invalid_create_time[0], "recent")
 
-    if not recent_convs:
+    if not matches:
         die("No conversations found.")
 
-    # Build matches list (id, title, create_time) for selection
-    matches: List[Tuple[str, str, float]] = []
-    for c, ctime in recent_convs:
-        cid, title = conv_id_and_title(c)
-        matches.append((cid, title or "", ctime))
-
     # For display, reverse so oldest of the N is #1 and newest is #N (chronological within the window)
     # Actually, let's keep newest at top (#1) for intuitive "most recent first"
     # matches is already newest-first from the sort above
@@ -258,8 +266,16 @@ def cmd_recent(args: argparse.Namespace) -> None:
 
     # Print numbered list
     print(f"\n=== {count} Most Recent Conversations ===\n")
-    for i, (cid, title, ctime) in enumerate(matches, start=1):
-        print(f"{i:>3}. {cid}\t{title}\t{ts_to_local_str(ctime)}")
+    # One write for the whole list; a terminal's line buffering would
+    # otherwise flush every row.
+    sys.stdout.write(
+        "".join(
+            [
+                f"{i:>3}. {cid}\t{title}\t{ts_to_local_str(ctime)}\n"
+                for i, (cid, title, ctime) in enumerate(matches, start=1)
+            ]
+        )
+    )
 
     print(f"\nSaved full list to: {all_ids_path}")
 
@@ -297,6 +313,7 @@ def cmd_recent(args: argparse.Namespace) -> None:
         used_links_file=options.used_links_file,
         config_file=options.config_file,
         name=options.name,
+        fields=fields,
     )
     print(f"\nWrote dossier: {out_path}")
 
@@ -332,60 +349,61 @@ def cmd_quick(args: argparse.Namespace) -> None:
     )
     selected_output_dir = project_output_dir(dossiers_dir, project_name)
     convs = load_conversations(root)
-    invalid_create_time = [0]
 
-    def _ctime_for(c: Dict[str, Any]) -> float:
-        return coerce_create_time(c.get("create_time"), invalid_create_time)
+    # Parse each create_time once; the recency filters, the match rows below
+    # and the dossier build all reuse it.
+    fields = ConversationFields()
+    invalid_create_time = [0]
+    candidates: List[Tuple[Dict[str, Any], str, str, float]] = []
+    for c in convs:
+        cid, title = fields.meta(c)
+        if cid:
+            ctime = fields.ctime(c, invalid_create_time)
+            candidates.append((c, cid, title, ctime))
 
     if days_count is not None:
         now_ts = datetime.now(tz=timezone.utc).timestamp()
         cutoff_ts = now_ts - (days_count * 86400.0)
-        filtered: List[Dict[str, Any]] = []
-        for c in convs:
-            cid, _ = conv_id_and_title(c)
-            if not cid:
-                continue
-            if _ctime_for(c) >= cutoff_ts:
-                filtered.append(c)
-        convs = filtered
+        candidates = [row for row in candidates if row[3] >= cutoff_ts]
     if recent_count is not None:
-        convs_with_time: List[Tuple[Any, float]] = []
-        for c in convs:
-            cid, _ = conv_id_and_title(c)
-            if not cid:
-                continue
-            ctime = _ctime_for(c)
-            convs_with_time.append((c, ctime))
-        convs_with_time.sort(key=lambda x: x[1], reverse=True)
-        convs = [c for c, _ in convs_with_time[:recent_count]]
+        candidates = heapq.nlargest(recent_count, candidates, key=itemgetter(3))
 
     needles = [t.lower() for t in topics]
     and_terms = bool(args.and_terms)
     where = getattr(args, "where", "title")
+    if where not in ("title", "messages", "all"):
+        die(f"Invalid --where value: {where}")
+    matches_all = all if and_terms else any
+
+    # A trigram index built from this export answers message matching exactly,
+    # so candidates are checked against its hits instead of their messages.
+    indexed_ids: Optional[Set[str]] = None
+    if where != "title":
+        _, extracted_dir, _ = ensure_layout(home)
+        db_path = extracted_dir / "cgpt_index.db"
+        if index_matches_root(db_path, root):
+            rows = search_index(db_path, topics, and_terms, where=where, exact=True)
+            if rows is not None:
+                indexed_ids = {cid for cid, _ in rows}
 
     matches: List[Tuple[str, str, float]] = []  # (id, title, create_time)
-    for c in convs:
-        cid, title = conv_id_and_title(c)
-        if not cid:
-            continue
-        title_lower = (title or "").lower()
-        messages_lower = ""
-        if where in ("messages", "all"):
-            messages_lower = conversation_messages_blob(c).lower()
-
-        checks: List[bool] = []
-        if where == "title":
-            checks = [n in title_lower for n in needles]
+    for c, cid, title, ctime in candidates:
+        if indexed_ids is not None:
+            matched = cid in indexed_ids
+        elif where == "title":
+            title_lower = fields.title_lower(c)
+            matched = matches_all(n in title_lower for n in needles)
         elif where == "messages":
-            checks = [n in messages_lower for n in needles]
-        elif where == "all":
-            checks = [(n in title_lower) or (n in messages_lower) for n in needles]
+            matched = conversation_has_terms(c, needles, require_all=and_terms)
         else:
-            die(f"Invalid --where value: {where}")
-
-        matched = all(checks) if and_terms else any(checks)
+            # Message text is only scanned for the needles the title can't settle.
+            title_lower = fields.title_lower(c)
+            pending = [n for n in needles if n not in title_lower]
+            if not pending or (not and_terms and len(pending) < len(needles)):
+                matched = True
+            else:
+                matched = conversation_has_terms(c, pending, require_all=and_terms)
         if matched:
-            ctime = _ctime_for(c)
             matches.append((cid, title or "", ctime))
 
     warn_invalid_create_time(invalid_create_time[0], "quick")
@@ -394,22 +412,31 @@ def cmd_quick(args: argparse.Namespace) -> None:
         die("No conversations matched those topic terms.")
 
     # Sort by conversation create_time (sane for selection)
-    matches.sort(key=lambda x: x[2])
+    matches.sort(key=itemgetter(2))
 
     slug = safe_slug("_".join(topics))
     all_ids_path, selected_ids_path = write_ids_tsv(selected_output_dir, slug, matches)
 
-    # Print numbered list
-    for i, (cid, title, ctime) in enumerate(matches, start=1):
-        colored_title = _colorize_title_with_topics(title or "", topics)
-        print(f"{i:>3}. {cid}\t{colored_title}\t{ts_to_local_str(ctime)}")
+    # Print numbered list, only when someone will pick from it at the prompt;
+    # --ids-file, --all and piped selections never show it to anyone.
+    ids_file = getattr(args, "ids_file", None)
+    if not (ids_file or args.all) and sys.stdin.isatty():
+        highlight = compile_title_highlighter(topics)
+        sys.stdout.write(
+            "".join(
+                [
+                    f"{i:>3}. {cid}\t{highlight(title or '')}\t{ts_to_local_str(ctime)}\n"
+                    for i, (cid, title, ctime) in enumerate(matches, start=1)
+                ]
+            )
+        )
 
     print(f"\nSaved full match list to: {all_ids_path}")
 
     picked = collect_selection_indices(
         matches=matches,
         select_all=bool(args.all),
-        ids_file=getattr(args, "ids_file", None),
+        ids_file=ids_file,
         allow_ids_file_include=True,
         pick_prompt="\nPick by number (e.g. 1 3 7), or 'all', or paste IDs: ",
         correction_prompt=(
@@ -446,5 +473,6 @@ def cmd_quick(args: argparse.Namespace) -> None:
         used_links_file=options.used_links_file,
         config_file=options.config_file,
         name=options.name,
+        fields=fields,
     )
     print(f"\nWrote dossier: {out_path}")
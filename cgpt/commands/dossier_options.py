@@ -22,17 +22,16 @@ class BuildOptions:
 
 
 def collect_wanted_ids(args: argparse.Namespace) -> List[str]:
-    wanted: List[str] = []
-    wanted.extend(getattr(args, "ids", None) or [])
+    wanted = list(filter(None, map(str.strip, getattr(args, "ids", None) or [])))
 
     ids_file = getattr(args, "ids_file", None)
     if ids_file:
         p = Path(ids_file).expanduser().resolve()
         if not p.exists():
             die(f"IDs file not found: {p}")
+        # Lines come back stripped and non-empty already.
         wanted.extend(read_nonempty_lines_utf8(p, label="IDs"))
 
-    wanted = [w.strip() for w in wanted if w.strip()]
     if not wanted:
         die("Provide --ids and/or --ids-file")
     return wanted
@@ -5,6 +5,7 @@ from cgpt.core.layout import (
     default_root,
     die,
     ensure_layout,
+    has_extracted,
     newest_extracted,
     newest_zip,
     refresh_latest_symlink,
@@ -12,8 +13,7 @@ from cgpt.core.layout import (
 from cgpt.core.project import get_project_extract_root, set_project_extract_root
 from cgpt.core.zip_safety import extract_zip_safely
 from cgpt.domain.conversations import (
-    find_conversations_json,
-    load_json,
+    find_conversations_payload,
     normalize_conversations,
 )
 
@@ -64,10 +64,7 @@ def ensure_root_with_latest(
         if project_root:
             return project_root, dossiers_dir
 
-    has_any_extracted = any(
-        p.is_dir() and p.name != "latest" for p in extracted_dir.iterdir()
-    )
-    if not has_any_extracted:
+    if not has_extracted(extracted_dir):
         zpath = newest_zip(zips_dir)
         out_dir = extracted_dir / zpath.stem
         extract_zip_safely(zpath, out_dir)
@@ -82,8 +79,8 @@ def ensure_root_with_latest(
 
 
 def load_conversations(root: Path) -> List[Dict[str, Any]]:
-    data_file = find_conversations_json(root)
-    if not data_file:
+    # Discovery already parsed the export; reuse it instead of reading it again.
+    found = find_conversations_payload(root)
+    if not found:
         die(f"No conversations JSON found under {root}")
-    data = load_json(data_file)
-    return normalize_conversations(data)
+    return normalize_conversations(found[1])
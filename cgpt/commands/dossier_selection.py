@@ -1,11 +1,41 @@
-import re
 import sys
+from contextlib import suppress
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-from cgpt.core.io import read_nonempty_lines_utf8, read_text_utf8
+from cgpt.core.io import read_nonempty_lines_utf8
 from cgpt.core.layout import die
 
+# Tokens are separated by commas and/or whitespace.
+_SELECTION_COMMAS_TO_SPACES = str.maketrans(",", " ")
+
+
+@lru_cache(maxsize=None)
+def _enable_line_editing() -> None:
+    """Enable line-editing for interactive `input()` (arrow keys, history, tab completion).
+
+    Imported on the first interactive prompt rather than at CLI startup, so
+    piped, `--all` and `--ids-file` runs never load it. On macOS this
+    typically wraps libedit; ignore failures if module/bindings differ.
+    """
+    with suppress(Exception):
+        import readline
+
+        with suppress(Exception):
+            readline.parse_and_bind("tab: complete")
+
+
+@lru_cache(maxsize=32)
+def _read_ids_include(path_str: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """Stripped, non-empty lines of an `@file` selection include.
+
+    The correction loop re-parses the whole selection, `@file` tokens
+    included; keying on `mtime_ns` and `size` re-reads a file only when it
+    has changed.
+    """
+    return tuple(read_nonempty_lines_utf8(Path(path_str), label="IDs"))
+
 
 def _parse_selection_text(
     raw_text: str,
@@ -13,7 +43,7 @@ def _parse_selection_text(
     *,
     allow_ids_file_include: bool,
 ) -> Tuple[List[int], List[str]]:
-    tokens = [t for t in re.split(r"[,\s]+", raw_text) if t]
+    tokens = raw_text.translate(_SELECTION_COMMAS_TO_SPACES).split()
     picked_local: List[int] = []
     warnings: List[str] = []
     id_to_index = {cid: idx for idx, (cid, _, _) in enumerate(matches, start=1)}
@@ -24,10 +54,8 @@ def _parse_selection_text(
             if not path.exists():
                 warnings.append(f"IDs file not found: {path}")
                 continue
-            for ln in read_text_utf8(path, label="IDs").splitlines():
-                ln = ln.strip()
-                if not ln:
-                    continue
+            st = path.stat()
+            for ln in _read_ids_include(str(path), st.st_mtime_ns, st.st_size):
                 if ln in id_to_index:
                     picked_local.append(id_to_index[ln])
                     continue
@@ -41,9 +69,10 @@ def _parse_selection_text(
                 warnings.append(f"Unknown ID in file: {ln}")
             continue
 
-        if re.match(r"^\d+-\d+$", tok):
-            a, b = tok.split("-", 1)
-            a_i, b_i = int(a), int(b)
+        # "N" or "A-B"; isdecimal() accepts exactly the digits int() parses.
+        lo, dash, hi = tok.partition("-")
+        if dash and lo.isdecimal() and hi.isdecimal():
+            a_i, b_i = int(lo), int(hi)
             if a_i > b_i:
                 a_i, b_i = b_i, a_i
             a_i = max(1, a_i)
@@ -55,7 +84,7 @@ def _parse_selection_text(
                 picked_local.append(n)
             continue
 
-        if tok.isdigit():
+        if not dash and tok.isdecimal():
             n = int(tok)
             if 1 <= n <= len(matches):
                 picked_local.append(n)
@@ -72,8 +101,7 @@ def _parse_selection_text(
 
 
 def _print_selection_warnings(warnings: List[str]) -> None:
-    for warning in warnings:
-        print(f"WARNING: {warning}", file=sys.stderr)
+    sys.stderr.write("".join([f"WARNING: {warning}\n" for warning in warnings]))
 
 
 def collect_selection_indices(
@@ -114,6 +142,7 @@ def collect_selection_indices(
             if warnings:
                 _print_selection_warnings(warnings)
         else:
+            _enable_line_editing()
             picked = []
             while True:
                 try:
@@ -157,6 +186,9 @@ def collect_selection_indices(
                 if not warnings:
                     break
 
+    # Already-sorted input (ranges, 'all') makes both steps linear: small ints
+    # iterate a set in order and Timsort detects the run. This measured faster
+    # than an order-preserving dedup plus a Python-level monotonic check.
     picked = sorted(set(picked))
     if not picked:
         die(no_valid_error)
@@ -168,6 +200,10 @@ def write_ids_tsv(
 ) -> Tuple[Path, Path]:
     all_ids_path = output_dir / f"ids__{slug}.tsv"
     selected_ids_path = output_dir / f"selected_ids__{slug}.txt"
-    all_lines = [f"{cid}\t{title}\n" for (cid, title, _) in matches]
-    all_ids_path.write_text("".join(all_lines), encoding="utf-8")
+    # One join and one text-mode write: faster than accumulating encoded rows
+    # in a bytearray, and keeps the platform newline translation.
+    all_ids_path.write_text(
+        "".join([f"{cid}\t{title}\n" for (cid, title, _) in matches]),
+        encoding="utf-8",
+    )
     return all_ids_path, selected_ids_path
@@ -1,4 +1,5 @@
 import argparse
+import os
 from pathlib import Path
 from typing import List
 
@@ -13,14 +14,11 @@ from cgpt.core.project import (
 
 
 def _project_dirs(dossiers_dir: Path) -> List[Path]:
-    return sorted(
-        [
-            p
-            for p in dossiers_dir.iterdir()
-            if p.is_dir() and not p.name.startswith(".")
-        ],
-        key=lambda p: p.name.lower(),
-    )
+    with os.scandir(dossiers_dir) as it:
+        dirs = [
+            Path(e.path) for e in it if not e.name.startswith(".") and e.is_dir()
+        ]
+    return sorted(dirs, key=lambda p: p.name.lower())
 
 
 def cmd_project_init(args: argparse.Namespace) -> None:
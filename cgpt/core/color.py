@@ -1,8 +1,9 @@
 import re
 import sys
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from cgpt.core.env import _parse_env_bool
+from cgpt.core.io import compile_ci, topic_alternation
 
 _CLI_COLOR_OVERRIDE: Optional[bool] = None
 
@@ -44,27 +45,47 @@ def _colorize_title_with_topic(title: str, topic: str) -> str:
         red = "\033[31m"
         white = "\033[97m"
         reset = "\033[0m"
-        pat = re.compile(re.escape(topic), re.IGNORECASE)
+        pat = compile_ci(re.escape(topic))
         highlighted = pat.sub(lambda m: f"{red}{m.group(0)}{white}", title)
         return f"{white}{highlighted}{reset}"
     except Exception:
         return title
 
-def _colorize_title_with_topics(title: str, topics: List[str]) -> str:
-    if not topics:
-        return title
-    if not _supports_color():
-        return title
+def _plain_title(title: str) -> str:
+    return title
+
+def compile_title_highlighter(topics: List[str]) -> Callable[[str], str]:
+    """Return a `_colorize_title_with_topics` for `topics`, resolved once.
+
+    Color support and the highlight pattern are settled up front, so commands
+    that print many titles don't re-check the terminal or rebuild the pattern
+    for each one.
+    """
+    if not topics or not _supports_color():
+        return _plain_title
+    alternation = topic_alternation(topics)
+    if not alternation:
+        return _plain_title
     try:
-        red = "\033[31m"
-        white = "\033[97m"
-        reset = "\033[0m"
-        parts = [re.escape(t) for t in topics if t]
-        if not parts:
-            return title
-        pat = re.compile("(" + "|".join(parts) + ")", re.IGNORECASE)
-        highlighted = pat.sub(lambda m: f"{red}{m.group(0)}{white}", title)
-        return f"{white}{highlighted}{reset}"
+        pat = compile_ci(alternation)
     except Exception:
-        return title
+        return _plain_title
+    red = "\033[31m"
+    white = "\033[97m"
+    reset = "\033[0m"
+
+    def mark(m: "re.Match[str]") -> str:
+        return f"{red}{m.group(0)}{white}"
+
+    def highlight(title: str) -> str:
+        try:
+            return f"{white}{pat.sub(mark, title)}{reset}"
+        except Exception:
+            return title
+
+    return highlight
+
+def _colorize_title_with_topics(title: str, topics: List[str]) -> str:
+    """Highlight `topics` in `title`; use `compile_title_highlighter` for many titles."""
+    return compile_title_highlighter(topics)(title)
 
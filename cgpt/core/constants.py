@@ -13,3 +13,6 @@ MAX_ZIP_UNCOMPRESSED_BYTES = _env_positive_int(
 JSON_DISCOVERY_BUCKET_LIMIT = _env_positive_int(
     "CGPT_JSON_DISCOVERY_BUCKET_LIMIT", 512
 )
+INDEX_WORKERS = _env_positive_int("CGPT_INDEX_WORKERS", 1)
+DOSSIER_WORKERS = _env_positive_int("CGPT_DOSSIER_WORKERS", 1)
+EXTRACT_WORKERS = _env_positive_int("CGPT_EXTRACT_WORKERS", 1)
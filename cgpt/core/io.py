@@ -1,7 +1,9 @@
 import argparse
+import math
 import re
 import sys
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, List, Optional
 
@@ -13,36 +15,74 @@ try:
 except Exception:
     ZoneInfo = None
 
+_RE_WHITESPACE_RUN = re.compile(r"\s+")
+_RE_SLUG_UNSAFE = re.compile(r"[^\w\-\.\s]", re.UNICODE)
+
 def safe_slug(s: str, max_len: int = 80) -> str:
     s = (s or "").strip()
-    s = re.sub(r"\s+", " ", s)
-    s = re.sub(r"[^\w\-\.\s]", "", s, flags=re.UNICODE)
+    s = _RE_WHITESPACE_RUN.sub(" ", s)
+    s = _RE_SLUG_UNSAFE.sub("", s)
     s = s.strip().replace(" ", "_")
     return s[:max_len] if len(s) > max_len else s
 
-def ts_to_local_str(ts: float) -> str:
-    if not ts:
-        return ""
+@lru_cache(maxsize=4096)
+def _ts_to_local_datetime(ts: float) -> datetime:
+    """Convert `ts` to the local zone; memoized, as datetimes are immutable.
+
+    The working index formats each conversation's create_time as a date
+    twice and as a full timestamp once, so the conversion is shared.
+    """
     dt_utc = datetime.fromtimestamp(ts, tz=timezone.utc)
     if ZoneInfo:
         try:
-            dt_loc = dt_utc.astimezone(ZoneInfo(SAO_PAULO_TZ))
-            return dt_loc.isoformat()
+            return dt_utc.astimezone(ZoneInfo(SAO_PAULO_TZ))
         except Exception:
-            return dt_utc.isoformat()
-    return dt_utc.isoformat()
+            return dt_utc
+    return dt_utc
+
+def ts_to_local_str(ts: float) -> str:
+    if not ts:
+        return ""
+    return _ts_to_local_datetime(ts).isoformat()
 
 def ts_to_local_date_str(ts: float) -> str:
-    rendered = ts_to_local_str(ts)
-    if not rendered:
+    # Format only the date rather than slicing a full timestamp string.
+    if not ts:
         return ""
-    return rendered[:10]
+    return _ts_to_local_datetime(ts).date().isoformat()
 
+@lru_cache(maxsize=8192)
 def normalize_text(s: str) -> str:
+    """Strip `s` and collapse whitespace runs to single spaces.
+
+    Memoized: branch trimming re-normalizes the same root messages for every
+    branch, and repeated paragraphs recur across dedup passes.
+    `build_combined_dossier` clears the cache per dossier to bound memory.
+    """
     s = (s or "").strip()
-    s = re.sub(r"\s+", " ", s)
+    s = _RE_WHITESPACE_RUN.sub(" ", s)
     return s
 
+@lru_cache(maxsize=4096)
+def compile_ci(pattern: str) -> re.Pattern:
+    """Compile `pattern` case-insensitively, memoized per pattern string.
+
+    Search terms are compiled once per distinct query rather than once per
+    conversation or title, and survive `re`'s own small internal cache.
+    """
+    return re.compile(pattern, re.IGNORECASE)
+
+def topic_alternation(topics: List[str]) -> str:
+    """Join `topics` into one escaped regex alternation, longest topic first.
+
+    Longest-first makes overlapping topics ("data", "data set") match the
+    longer one. Blank and repeated topics are dropped; an empty string means
+    there is nothing to match. Callers compile it with `compile_ci`, so the
+    excerpt pattern and the title highlighter share one compiled pattern.
+    """
+    unique = dict.fromkeys(t for t in topics if t.strip())
+    return "|".join(re.escape(t) for t in sorted(unique, key=len, reverse=True))
+
 def read_text_utf8(path: Path, *, label: str) -> str:
     """Read text inputs with UTF-8/UTF-8-BOM support and clear decode failures."""
     try:
@@ -53,7 +93,9 @@ def read_text_utf8(path: Path, *, label: str) -> str:
         die(f"Failed to read {label} file: {path}\n{e}")
 
 def read_nonempty_lines_utf8(path: Path, *, label: str) -> List[str]:
-    return [ln.strip() for ln in read_text_utf8(path, label=label).splitlines() if ln.strip()]
+    """Stripped, non-empty lines of a UTF-8 text input (each line stripped once)."""
+    lines = read_text_utf8(path, label=label).splitlines()
+    return list(filter(None, map(str.strip, lines)))
 
 def require_existing_file(path_value: str, *, label: str) -> Path:
     path = Path(path_value).expanduser().resolve()
@@ -76,11 +118,15 @@ def parse_context(value: Any) -> int:
 
 def coerce_create_time(value: Any, invalid_counter: Optional[List[int]] = None) -> float:
     try:
-        return float(value or 0.0)
+        ts = float(value or 0.0)
     except (TypeError, ValueError):
-        if invalid_counter is not None:
-            invalid_counter[0] += 1
-        return 0.0
+        ts = math.nan
+    if math.isfinite(ts):
+        return ts
+    # NaN and infinity can't be ordered or formatted as dates: invalid too.
+    if invalid_counter is not None:
+        invalid_counter[0] += 1
+    return 0.0
 
 def warn_invalid_create_time(invalid_count: int, command_name: str) -> None:
     if invalid_count > 0:
@@ -2,8 +2,9 @@ import os
 import shutil
 import sys
 from contextlib import suppress
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional, Set, Tuple
 
 
 def die(msg: str, code: int = 1) -> None:
@@ -30,12 +31,13 @@ def discover_home() -> Path:
     with suppress(Exception):
         candidates.append(Path(__file__).resolve().parent)
 
-    seen = set()
+    seen: Set[str] = set()
     for base in candidates:
-        for p in [base, *list(base.parents)[:8]]:
-            if p in seen:
+        for p in (base, *islice(base.parents, 8)):
+            key = str(p)
+            if key in seen:
                 continue
-            seen.add(p)
+            seen.add(key)
             if looks_like_home(p):
                 return p
 
@@ -84,18 +86,32 @@ def init_layout(home: Path) -> Tuple[List[Path], List[Path]]:
 
     return created, existing
 
+def _newest_entry(entries: List["os.DirEntry[str]"]) -> Path:
+    # DirEntry caches its stat result, so sorting costs one stat per entry.
+    return Path(max(entries, key=lambda e: e.stat().st_mtime).path)
+
 def newest_zip(zips_dir: Path) -> Path:
-    zips = sorted(zips_dir.glob("*.zip"), key=lambda p: p.stat().st_mtime, reverse=True)
+    with os.scandir(zips_dir) as it:
+        zips = [e for e in it if e.name.endswith(".zip")]
     if not zips:
         die(f"No ZIPs found in {zips_dir}")
-    return zips[0]
+    return _newest_entry(zips)
+
+def has_extracted(extracted_dir: Path) -> bool:
+    """Whether `extracted_dir` holds any export folder besides `latest`.
+
+    Stops at the first one; `DirEntry.is_dir()` answers from the directory
+    listing without a stat call for anything but symlinks.
+    """
+    with os.scandir(extracted_dir) as it:
+        return any(e.name != "latest" and e.is_dir() for e in it)
 
 def newest_extracted(extracted_dir: Path) -> Path:
-    dirs = [p for p in extracted_dir.iterdir() if p.is_dir() and p.name != "latest"]
+    with os.scandir(extracted_dir) as it:
+        dirs = [e for e in it if e.is_dir() and e.name != "latest"]
     if not dirs:
         die(f"No extracted folders found in {extracted_dir}. Run: cgpt.py extract")
-    dirs.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return dirs[0]
+    return _newest_entry(dirs)
 
 def refresh_latest_symlink(extracted_dir: Path, target: Path) -> None:
     """Point extracted/latest to target. Fall back to extracted/LATEST.txt if symlink fails."""
@@ -4,9 +4,15 @@ import shutil
 import stat
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List
 
-from cgpt.core.constants import MAX_ZIP_MEMBERS, MAX_ZIP_UNCOMPRESSED_BYTES
+from cgpt.core.constants import (
+    EXTRACT_WORKERS,
+    MAX_ZIP_MEMBERS,
+    MAX_ZIP_UNCOMPRESSED_BYTES,
+)
 from cgpt.core.layout import die
 
 
@@ -61,6 +67,54 @@ def validate_zip_members_safe(zf: zipfile.ZipFile, dest_dir: Path) -> None:
                 f"{total_uncompressed} > {MAX_ZIP_UNCOMPRESSED_BYTES} bytes."
             )
 
+def _member_target_key(name: str) -> str:
+    """Path a member extracts to, normalized the way `ZipFile.extract` does."""
+    return "/".join(p for p in name.split("/") if p not in ("", ".", ".."))
+
+def _extract_member_slice(zpath: Path, infos: List[zipfile.ZipInfo], dest: Path) -> None:
+    # Each thread reads through its own handle; a ZipFile's file position is
+    # shared state.
+    with zipfile.ZipFile(zpath, "r") as zf:
+        for info in infos:
+            zf.extract(info, dest)
+
+def _extract_all(zf: zipfile.ZipFile, zpath: Path, dest: Path, workers: int) -> None:
+    """`zf.extractall(dest)`, spread across `workers` threads when it is safe.
+
+    zlib releases the GIL while inflating, so large exports extract faster in
+    parallel. Directories are created up front so threads never race on
+    `makedirs`; archives that write one path twice keep the serial
+    last-one-wins order. Paths are compared casefolded, since names that
+    differ only in case are one file on case-insensitive filesystems.
+    """
+    if workers <= 1:
+        zf.extractall(dest)
+        return
+    infos = zf.infolist()
+    files = [info for info in infos if not info.is_dir()]
+    targets = {_member_target_key(info.filename).casefold() for info in infos}
+    if len(files) < 2 or len(targets) != len(infos):
+        zf.extractall(dest)
+        return
+
+    for info in infos:
+        if info.is_dir():
+            zf.extract(info, dest)
+        else:
+            parent = os.path.dirname(_member_target_key(info.filename))
+            if parent:
+                os.makedirs(dest / parent, exist_ok=True)
+
+    # Largest members first, dealt round-robin, to balance the slices.
+    files.sort(key=lambda info: info.compress_size, reverse=True)
+    slices = [files[i::workers] for i in range(min(workers, len(files)))]
+    with ThreadPoolExecutor(max_workers=len(slices)) as pool:
+        futures = [
+            pool.submit(_extract_member_slice, zpath, part, dest) for part in slices
+        ]
+        for future in futures:
+            future.result()
+
 def extract_zip_safely(zpath: Path, out_dir: Path) -> None:
     parent = out_dir.parent
     temp_dir = parent / f".{out_dir.name}.tmp-{os.getpid()}-{int(time.time() * 1_000_000)}"
@@ -68,7 +122,7 @@ def extract_zip_safely(zpath: Path, out_dir: Path) -> None:
         with zipfile.ZipFile(zpath, "r") as zf:
             validate_zip_members_safe(zf, out_dir)
             temp_dir.mkdir(parents=True, exist_ok=False)
-            zf.extractall(temp_dir)
+            _extract_all(zf, zpath, temp_dir, EXTRACT_WORKERS)
 
         if out_dir.exists():
             if out_dir.is_symlink() or not out_dir.is_dir():
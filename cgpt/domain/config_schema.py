@@ -1,7 +1,8 @@
 import json
+import re
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from cgpt.core.io import coerce_create_time, ts_to_local_date_str
 from cgpt.core.layout import die
@@ -151,30 +152,65 @@ def load_column_config(config_file: str) -> Dict[str, Any]:
         die(f"Error loading config: {e}")
     return validate_column_config_schema(data)
 
-def matches_thread_filter(
-    title: str, config: Dict[str, Any]
-) -> Tuple[bool, Optional[str]]:
-    """Check if thread title matches include/exclude filters. Returns (include, tag)."""
-    if not title:
-        return False, None
-
-    title_lower = title.lower()
+def _substring_pattern(terms: List[str]) -> Optional["re.Pattern[str]"]:
+    """One alternation matching any lowercased term as a plain substring."""
+    if not terms:
+        return None
+    return re.compile("|".join(re.escape(term.lower()) for term in terms))
+
+def compile_thread_filter(
+    config: Dict[str, Any],
+) -> Callable[[str], Tuple[bool, Optional[str]]]:
+    """Return a `matches_thread_filter` for `config` with its terms compiled once.
+
+    Each term list becomes a single alternation, so a title is scanned once per
+    bucket instead of once per term. A combined alternation over every term
+    settles the common no-hit case in a single scan; the per-list patterns then
+    only run on titles that contain at least one term.
+    """
     filters = config.get("thread_filters", {})
-    exclude_list = filters.get("exclude", [])
-    include_dict = filters.get("include", {})
+    exclude_terms = filters.get("exclude", [])
+    exclude_re = _substring_pattern(exclude_terms)
+    all_terms = list(exclude_terms)
+    include_res = []
+    for bucket_name, terms in filters.get("include", {}).items():
+        pattern = _substring_pattern(terms)
+        if pattern is not None:
+            include_res.append((bucket_name, pattern))
+            all_terms.extend(terms)
+    any_term_re = _substring_pattern(all_terms)
+
+    def match(title: str) -> Tuple[bool, Optional[str]]:
+        if not title:
+            return False, None
+
+        title_lower = title.lower()
+        if any_term_re is None or not any_term_re.search(title_lower):
+            return False, None
 
-    # Check exclude list first
-    for exclude_term in exclude_list:
-        if exclude_term.lower() in title_lower:
+        # Check exclude list first
+        if exclude_re is not None and exclude_re.search(title_lower):
             return False, None
 
-    # Check include buckets
-    for bucket_name, terms in include_dict.items():
-        for term in terms:
-            if term.lower() in title_lower:
+        # Check include buckets
+        for bucket_name, pattern in include_res:
+            if pattern.search(title_lower):
                 return True, bucket_name
 
-    return False, None
+        return False, None
+
+    return match
+
+def matches_thread_filter(
+    title: str, config: Dict[str, Any]
+) -> Tuple[bool, Optional[str]]:
+    """Check if thread title matches include/exclude filters. Returns (include, tag).
+
+    When checking many titles against one config, use `compile_thread_filter`.
+    """
+    if not title:
+        return False, None
+    return compile_thread_filter(config)(title)
 
 def generate_completeness_check(
     convs: List[Dict[str, Any]], config: Dict[str, Any]
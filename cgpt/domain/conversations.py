@@ -1,16 +1,28 @@
 import heapq
 import json
+import mmap
 import re
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from cgpt.core.constants import (
     JSON_DISCOVERY_BUCKET_LIMIT as _DEFAULT_JSON_DISCOVERY_BUCKET_LIMIT,
 )
-from cgpt.core.io import coerce_create_time, normalize_text
+from cgpt.core.io import (
+    coerce_create_time,
+    compile_ci,
+    normalize_text,
+    topic_alternation,
+)
 from cgpt.core.layout import die
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 JSON_DISCOVERY_BUCKET_LIMIT = _DEFAULT_JSON_DISCOVERY_BUCKET_LIMIT
 
 def _json_candidate_priority(path: Path) -> int:
@@ -29,10 +41,38 @@ def _safe_file_size(path: Path) -> int:
     except OSError:
         return -1
 
+def _parse_json_bytes(raw: bytes) -> Any:
+    """Parse a JSON document, preferring orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than stdlib (NaN, >64-bit ints); retry below.
+            pass
+    return json.loads(raw.decode("utf-8"))
+
+def _parse_json_file(path: Path) -> Any:
+    """Parse the JSON file at `path`, like `_parse_json_bytes(path.read_bytes())`.
+
+    With orjson the file is memory-mapped and parsed in place, so the export
+    is never copied into a `bytes` object first. Empty or unmappable files
+    are read normally.
+    """
+    if orjson is not None:
+        try:
+            with open(path, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        except orjson.JSONDecodeError:
+            return json.loads(path.read_bytes().decode("utf-8"))
+        except (OSError, ValueError):
+            pass
+    return _parse_json_bytes(path.read_bytes())
+
 def load_json_loose(path: Path) -> Optional[Any]:
     try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return _parse_json_file(path)
     except Exception:
         return None
 
@@ -56,7 +96,7 @@ def _looks_like_conversations_payload(data: Any) -> bool:
         convs = data.get("conversations")
         if isinstance(convs, list):
             return any(_looks_like_conversation_record(item) for item in convs[:50])
-        values = list(data.values())[:50]
+        values = list(islice(data.values(), 50))
         if values and all(isinstance(v, dict) for v in values):
             return any(_looks_like_conversation_record(v) for v in values)
     return False
@@ -73,7 +113,12 @@ def _push_json_candidate(
     if entry[:2] > heap[0][:2]:
         heapq.heapreplace(heap, entry)
 
-def find_conversations_json(root: Path) -> Optional[Path]:
+def find_conversations_payload(root: Path) -> Optional[Tuple[Path, Any]]:
+    """Locate the conversations JSON under `root`; return it with its parsed data.
+
+    Discovery parses each candidate to validate it, so callers that go on to
+    read the export should take the data from here rather than reload the file.
+    """
     buckets: Dict[int, List[Tuple[int, str, Path]]] = {30: [], 25: [], 20: [], 0: []}
     saw_json = False
     for path in root.rglob("*.json"):
@@ -97,13 +142,16 @@ def find_conversations_json(root: Path) -> Optional[Path]:
         if data is None:
             continue
         if _looks_like_conversations_payload(data):
-            return candidate
+            return candidate, data
     return None
 
+def find_conversations_json(root: Path) -> Optional[Path]:
+    found = find_conversations_payload(root)
+    return found[0] if found else None
+
 def load_json(p: Path) -> Any:
     try:
-        with p.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return _parse_json_file(p)
     except Exception as e:
         die(f"Failed to parse JSON: {p}\n{e}")
 
@@ -133,17 +181,80 @@ def conv_id_and_title(c: Dict[str, Any]) -> Tuple[Optional[str], str]:
     )
     return cid, title
 
-def build_conversation_map_by_id(convs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+class ConversationFields:
+    """Per-run memo of derived conversation fields: ID/title, lowercased title, create_time.
+
+    A command visits each selected conversation several times (selection rows,
+    ID map, dossier body, working index). Build one of these where the
+    conversations are loaded and pass it along, so each field is derived once.
+    Conversations are not modified. The memo is a snapshot: build a new one
+    after editing conversations. Entries are keyed by `id(c)` and hold `c`, so
+    an id cannot be reused while the memo is alive.
+    """
+
+    __slots__ = ("_meta", "_title_lower", "_ctime")
+
+    def __init__(self) -> None:
+        self._meta: Dict[int, Tuple[Dict[str, Any], Tuple[Optional[str], str]]] = {}
+        self._title_lower: Dict[int, Tuple[Dict[str, Any], str]] = {}
+        self._ctime: Dict[int, Tuple[Dict[str, Any], float, bool]] = {}
+
+    def meta(self, c: Dict[str, Any]) -> Tuple[Optional[str], str]:
+        """`conv_id_and_title(c)`."""
+        entry = self._meta.get(id(c))
+        if entry is None:
+            entry = self._meta[id(c)] = (c, conv_id_and_title(c))
+        return entry[1]
+
+    def title_lower(self, c: Dict[str, Any]) -> str:
+        """Lowercased `meta(c)` title."""
+        entry = self._title_lower.get(id(c))
+        if entry is None:
+            entry = self._title_lower[id(c)] = (c, self.meta(c)[1].lower())
+        return entry[1]
+
+    def ctime(
+        self, c: Dict[str, Any], invalid_counter: Optional[List[int]] = None
+    ) -> float:
+        """`coerce_create_time(c.get("create_time"), invalid_counter)`.
+
+        Whether the raw value was invalid is memoized too, so every caller's
+        `invalid_counter` still counts it.
+        """
+        entry = self._ctime.get(id(c))
+        if entry is None:
+            invalid = [0]
+            ctime = coerce_create_time(c.get("create_time"), invalid)
+            entry = self._ctime[id(c)] = (c, ctime, bool(invalid[0]))
+        if entry[2] and invalid_counter is not None:
+            invalid_counter[0] += 1
+        return entry[1]
+
+def build_conversation_map_by_id(
+    convs: List[Dict[str, Any]],
+    wanted: Optional[Iterable[str]] = None,
+    fields: Optional[ConversationFields] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Map conversation ID -> conversation; duplicate IDs in `convs` are fatal.
+
+    With `wanted`, only those IDs are mapped. Every ID in the export is still
+    checked for duplicates. IDs are read through `fields` when given.
+    """
+    conv_meta = fields.meta if fields is not None else conv_id_and_title
+    wanted_set = None if wanted is None else set(wanted)
     by_id: Dict[str, Dict[str, Any]] = {}
+    seen: Set[str] = set()
     duplicates: Set[str] = set()
     for conv in convs:
-        cid, _ = conv_id_and_title(conv)
+        cid, _ = conv_meta(conv)
         if not cid:
             continue
-        if cid in by_id:
+        if cid in seen:
             duplicates.add(cid)
             continue
-        by_id[cid] = conv
+        seen.add(cid)
+        if wanted_set is None or cid in wanted_set:
+            by_id[cid] = conv
     if duplicates:
         die(
             "Duplicate conversation ID(s) found in export:\n"
@@ -154,99 +265,196 @@ def build_conversation_map_by_id(convs: List[Dict[str, Any]]) -> Dict[str, Dict[
 def render_content(content: Any) -> str:
     if not isinstance(content, dict):
         return ""
-    ctype = content.get("content_type")
     parts = content.get("parts")
-    if ctype == "text" and isinstance(parts, list):
-        return "\n".join(str(p) for p in parts if p is not None).strip()
-    if isinstance(parts, list) and parts:
+    if isinstance(parts, list) and (parts or content.get("content_type") == "text"):
+        # Common case: a text message whose parts are all plain strings.
+        if all(type(p) is str for p in parts):
+            return "\n".join(parts).strip()
         return "\n".join(str(p) for p in parts if p is not None).strip()
-    if "text" in content and isinstance(content["text"], str):
-        return content["text"].strip()
-    return ""
+    text = content.get("text")
+    return text.strip() if isinstance(text, str) else ""
 
 @dataclass
 class Msg:
+    __slots__ = ("t", "role", "text")
+
     t: float
     role: str
     text: str
 
-def extract_messages_best_effort(c: Dict[str, Any]) -> List[Msg]:
-    msgs: List[Msg] = []
+# Parsed JSON gives every message its own role string; share the common ones.
+_ROLE_INTERN = {
+    role: role for role in ("user", "assistant", "system", "tool", "unknown")
+}
+
+def _row_time(row: Tuple[float, str, str]) -> float:
+    return row[0]
 
+def _message_nodes(c: Dict[str, Any]) -> Iterable[Any]:
+    """Return the raw message objects of `c`, in export order."""
     mapping = c.get("mapping")
-    if not isinstance(mapping, dict):
-        flat = c.get("messages")
-        if isinstance(flat, list):
-            for m in flat:
-                if not isinstance(m, dict):
-                    continue
-                t = coerce_create_time(m.get("create_time"))
-                role = (m.get("author") or {}).get("role") or "unknown"
-                text = render_content(m.get("content") or {}).strip()
-                if text:
-                    msgs.append(Msg(t=t, role=role, text=text))
-        msgs.sort(key=lambda x: x.t)
-        return msgs
-
-    for node in mapping.values():
-        if not isinstance(node, dict):
-            continue
-        m = node.get("message")
+    if isinstance(mapping, dict):
+        return [
+            node.get("message") for node in mapping.values() if isinstance(node, dict)
+        ]
+    flat = c.get("messages")
+    return flat if isinstance(flat, list) else ()
+
+def _message_rows(c: Dict[str, Any]) -> List[Tuple[float, str, str]]:
+    """Return time-sorted (create_time, role, text) rows in one pass over `c`."""
+    nodes = _message_nodes(c)
+
+    rows: List[Tuple[float, str, str]] = []
+    append = rows.append
+    for m in nodes:
         if not isinstance(m, dict):
             continue
-        t = coerce_create_time(m.get("create_time"))
-        author = m.get("author") or {}
-        role = author.get("role") or "unknown"
-        content = m.get("content") or {}
-        text = render_content(content).strip()
+        text = render_content(m.get("content") or {})
         if text:
-            msgs.append(Msg(t=t, role=role, text=text))
+            role = (m.get("author") or {}).get("role") or "unknown"
+            if isinstance(role, str):
+                role = _ROLE_INTERN.get(role, role)
+            append((coerce_create_time(m.get("create_time")), role, text))
+    rows.sort(key=_row_time)
+    return rows
 
-    msgs.sort(key=lambda x: x.t)
-    return msgs
+def extract_messages_best_effort(c: Dict[str, Any]) -> List[Msg]:
+    return [Msg(t, role, text) for t, role, text in _message_rows(c)]
+
+def conversation_text(c: Dict[str, Any]) -> str:
+    """Message texts of `c` joined in time order, without building `Msg` objects."""
+    return "\n".join([row[2] for row in _message_rows(c)])
 
 def conversation_messages_blob(c: Dict[str, Any]) -> str:
     try:
-        msgs = extract_messages_best_effort(c)
-        return "\n".join(m.text for m in msgs)
+        return conversation_text(c)
     except Exception:
         return ""
 
-def excerpt_messages(msgs: List[Msg], pattern: re.Pattern, context: int) -> List[Msg]:
-    if not msgs:
-        return []
-    hits = [i for i, m in enumerate(msgs) if pattern.search(m.text)]
-    if not hits:
-        return []
-    keep = set()
-    for i in hits:
-        for j in range(max(0, i - context), min(len(msgs), i + context + 1)):
-            keep.add(j)
-    return [msgs[i] for i in sorted(keep)]
+def conversation_has_terms(
+    c: Dict[str, Any], terms_lower: List[str], *, require_all: bool
+) -> bool:
+    """Whether the message text of `c` contains any (or all) of `terms_lower`.
+
+    Same result as testing the terms against `conversation_messages_blob(c)`
+    lowercased, but messages are scanned in export order without sorting or
+    joining, and the scan stops as soon as the answer is settled. Terms that
+    span a line break can straddle two messages, so they take the blob path.
+    """
+    if any("\n" in term for term in terms_lower):
+        blob = conversation_messages_blob(c).lower()
+        hits = (term in blob for term in terms_lower)
+        return all(hits) if require_all else any(hits)
+
+    pending = terms_lower
+    if require_all and not pending:
+        return True
+    try:
+        for m in _message_nodes(c):
+            if not isinstance(m, dict):
+                continue
+            text = render_content(m.get("content") or {})
+            if not text:
+                continue
+            text_lower = text.lower()
+            if require_all:
+                pending = [term for term in pending if term not in text_lower]
+                if not pending:
+                    return True
+            elif any(term in text_lower for term in pending):
+                return True
+    except Exception:
+        pass
+    return False
+
+def excerpt_messages(
+    msgs: List[Msg],
+    pattern: "TopicPattern",
+    context: int,
+    hit_cache: Optional[Dict[str, bool]] = None,
+) -> List[Msg]:
+    """Return the messages matching `pattern`, each with `context` neighbours.
+
+    `hit_cache` maps message text to its search result for the same `pattern`;
+    sibling branches repeat the messages they share past the root's branch
+    point, so a thread can pass one cache to skip re-searching them.
+    """
+    # Hits arrive in ascending order, so each context window either extends the
+    # previous one or starts after it; emit only the part not yet emitted.
+    n = len(msgs)
+    out: List[Msg] = []
+    emitted_to = 0
+    search = pattern.search
+    for i, m in enumerate(msgs):
+        if hit_cache is None:
+            hit = search(m.text) is not None
+        else:
+            hit = hit_cache.get(m.text)
+            if hit is None:
+                hit = hit_cache[m.text] = search(m.text) is not None
+        if not hit:
+            continue
+        lo = max(emitted_to, i - context)
+        hi = min(n, i + context + 1)
+        if lo < hi:
+            out.extend(msgs[lo:hi])
+            emitted_to = hi
+    return out
+
+_RE_BRANCH_PREFIX = re.compile(r"^\s*Branch\s*[·\-:]\s*", re.IGNORECASE)
 
 def base_title(title: str) -> str:
     t = (title or "").strip()
-    t = re.sub(r"^\s*Branch\s*[·\-:]\s*", "", t, flags=re.IGNORECASE)
+    t = _RE_BRANCH_PREFIX.sub("", t)
     return t.strip()
 
-def longest_common_prefix_len(
-    a: List[Tuple[str, str]], b: List[Tuple[str, str]]
-) -> int:
-    n = min(len(a), len(b))
-    i = 0
-    while i < n and a[i] == b[i]:
-        i += 1
-    return i
-
 def trim_branch_new_part(root_msgs: List[Msg], branch_msgs: List[Msg]) -> List[Msg]:
-    ra = [(m.role, normalize_text(m.text)) for m in root_msgs]
-    rb = [(m.role, normalize_text(m.text)) for m in branch_msgs]
-    k = longest_common_prefix_len(ra, rb)
+    """Return the messages of `branch_msgs` after its shared prefix with `root_msgs`.
+
+    Compares pairwise and stops at the first divergence, so messages past the
+    branch point are never normalized.
+    """
+    k = 0
+    for r, b in zip(root_msgs, branch_msgs):
+        if r.role != b.role:
+            break
+        if r.text != b.text and normalize_text(r.text) != normalize_text(b.text):
+            break
+        k += 1
     return branch_msgs[k:]
 
-def compile_topic_pattern(topics: List[str]) -> re.Pattern:
-    parts = [re.escape(t) for t in topics if t.strip()]
-    if not parts:
+class TopicPattern:
+    """Compiled topics for excerpt searches: `re` results, literal fast path.
+
+    For ASCII topics, `re.IGNORECASE` only matches text whose casefold
+    contains a casefolded topic (the Turkish dotted/dotless i aside), so most
+    messages, which mention no topic, are ruled out by substring tests before
+    the regex runs.
+    """
+
+    __slots__ = ("regex", "folded", "check_turkish_i")
+
+    def __init__(self, regex: re.Pattern, folded: Optional[Tuple[str, ...]]) -> None:
+        self.regex = regex
+        self.folded = folded
+        self.check_turkish_i = folded is not None and any("i" in t for t in folded)
+
+    def search(self, text: str) -> Optional["re.Match[str]"]:
+        folded = self.folded
+        if folded is not None:
+            text_folded = text.casefold()
+            if not any(t in text_folded for t in folded) and not (
+                self.check_turkish_i and ("\u0130" in text or "\u0131" in text)
+            ):
+                return None
+        return self.regex.search(text)
+
+def compile_topic_pattern(topics: List[str]) -> TopicPattern:
+    alternation = topic_alternation(topics)
+    if not alternation:
         # never match
-        return re.compile(r"a^")
-    return re.compile("|".join(parts), re.IGNORECASE)
+        return TopicPattern(re.compile(r"a^"), ())
+    folded = None
+    if alternation.isascii():
+        folded = tuple(dict.fromkeys(t.casefold() for t in topics if t.strip()))
+    return TopicPattern(compile_ci(alternation), folded)
@@ -1,11 +1,15 @@
+import io
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
+from cgpt.core.constants import DOSSIER_WORKERS
 from cgpt.core.io import (
-    coerce_create_time,
+    normalize_text,
     read_text_utf8,
     require_existing_file,
     safe_slug,
@@ -18,22 +22,21 @@ from cgpt.domain.config_schema import (
     load_column_config,
 )
 from cgpt.domain.conversations import (
+    ConversationFields,
+    TopicPattern,
     base_title,
     build_conversation_map_by_id,
     compile_topic_pattern,
-    conv_id_and_title,
     excerpt_messages,
     extract_messages_best_effort,
     trim_branch_new_part,
 )
 from cgpt.domain.dossier_cleaning import (
     _build_clean_txt,
-    _dedupe_appendix_header,
     _deduplicate_blocks,
     _extract_deliverables,
     _generate_working_index,
     _generate_working_index_with_tags,
-    _remove_appendix_header_lines,
     _reorganize_sources_section,
     _replace_dead_citations,
     _sanitize_openai_markup,
@@ -43,30 +46,69 @@ from cgpt.domain.dossier_cleaning import (
     extract_research_artifacts,
 )
 
+_RE_MD_NEWLINE = re.compile(r"\r\n?")
+_RE_MD_HEADING = re.compile(r"(?m)^#{1,6}\s*")
+_RE_MD_BOLD = re.compile(r"\*\*(.*?)\*\*")
+_RE_MD_ITALIC = re.compile(r"\*(.*?)\*")
+_RE_MD_CODE_BLOCK = re.compile(r"```.*?```", re.S)
+_RE_MD_INLINE_CODE = re.compile(r"`([^`]+)`")
+_RE_MD_LINK = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+_RE_MD_BLANK_RUN = re.compile(r"\n{3,}")
+
 
 def markdown_to_plain_text(md: str) -> str:
     """Convert markdown to plain text for DOCX paragraph emission."""
-    s = re.sub(r"\r\n?", "\n", md)
-    s = re.sub(r"(?m)^#{1,6}\s*", "", s)
-    s = re.sub(r"\*\*(.*?)\*\*", r"\1", s)
-    s = re.sub(r"\*(.*?)\*", r"\1", s)
-    s = re.sub(r"```.*?```", "", s, flags=re.S)
-    s = re.sub(r"`([^`]+)`", r"\1", s)
-    s = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", s)
-    s = re.sub(r"\n{3,}", "\n\n", s)
+    s = _RE_MD_NEWLINE.sub("\n", md)
+    s = _RE_MD_HEADING.sub("", s)
+    s = _RE_MD_BOLD.sub(r"\1", s)
+    s = _RE_MD_ITALIC.sub(r"\1", s)
+    s = _RE_MD_CODE_BLOCK.sub("", s)
+    s = _RE_MD_INLINE_CODE.sub(r"\1", s)
+    s = _RE_MD_LINK.sub(r"\1", s)
+    s = _RE_MD_BLANK_RUN.sub("\n\n", s)
     return s.strip() + "\n"
 
 
+# Characters str.splitlines() treats as line boundaries.
+_LINE_BOUNDARIES = frozenset("\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+
+
+def _count_exact_lines(text: str, target: str) -> int:
+    """Count lines of `text` whose stripped content equals `target`.
+
+    Same result as summing `line.strip() == target` over `text.splitlines()`
+    (for a `target` with no surrounding whitespace or line breaks), but only
+    the lines around `str.find` hits are inspected, so no line list is built.
+    """
+    n = len(text)
+    count = 0
+    pos = text.find(target)
+    while pos >= 0:
+        end = pos + len(target)
+        i = pos
+        while i > 0 and text[i - 1].isspace() and text[i - 1] not in _LINE_BOUNDARIES:
+            i -= 1
+        j = end
+        while j < n and text[j].isspace() and text[j] not in _LINE_BOUNDARIES:
+            j += 1
+        if (i == 0 or text[i - 1] in _LINE_BOUNDARIES) and (
+            j == n or text[j] in _LINE_BOUNDARIES
+        ):
+            count += 1
+        pos = text.find(target, end)
+    return count
+
+
 def _load_used_links(used_links_file: Optional[str]) -> Optional[Set[str]]:
     if not used_links_file:
         return None
     used_links_path = require_existing_file(used_links_file, label="used-links")
     used_links_text = read_text_utf8(used_links_path, label="used-links")
-    return {
-        line.strip()
-        for line in used_links_text.splitlines()
-        if line.strip() and not line.startswith("#")
-    }
+    # Comments are recognized on the raw line; each kept line is stripped once.
+    lines = [line for line in used_links_text.splitlines() if not line.startswith("#")]
+    used_links = set(map(str.strip, lines))
+    used_links.discard("")
+    return used_links
 
 
 def _build_working_txt_variant(
@@ -80,6 +122,7 @@ def _build_working_txt_variant(
     by_id: Dict[str, Dict[str, Any]],
     wanted_ids: List[str],
     topics: List[str],
+    fields: ConversationFields,
 ) -> Tuple[str, bool]:
     config = load_column_config(config_file) if config_file else None
     used_links = _load_used_links(used_links_file)
@@ -90,7 +133,6 @@ def _build_working_txt_variant(
     working_txt = _strip_citation_markers(working_txt)
     working_txt = _sanitize_openai_markup(working_txt)
     working_txt = _strip_existing_appendix(working_txt)
-    working_txt = _remove_appendix_header_lines(working_txt)
     working_txt = _replace_dead_citations(working_txt, {})
     if dedup:
         working_txt = _deduplicate_blocks(working_txt, min_block_size=200)
@@ -116,17 +158,17 @@ def _build_working_txt_variant(
     if config:
         control_layer = generate_control_layer(config)
         completeness = generate_completeness_check(convs, config)
-        front_matter = (
-            control_layer
-            + "COMPLETENESS CHECK\n"
-            + "=" * 70
-            + "\n"
-            + completeness
-            + "\n"
-            + "=" * 70
-            + "\n\n"
+        working_txt = "".join(
+            (
+                control_layer,
+                "COMPLETENESS CHECK\n",
+                "=" * 70 + "\n",
+                completeness,
+                "\n",
+                "=" * 70 + "\n\n",
+                working_txt,
+            )
         )
-        working_txt = front_matter + working_txt
 
     if not working_txt.strip():
         die("NO INCLUDED THREADS/SEGMENTS — CHECK FILTERS/KEYWORDS/PATTERNS")
@@ -141,33 +183,144 @@ def _build_working_txt_variant(
             conversations=selected_convs,
             topics=topics,
             config=config,
+            fields=fields,
         )
     else:
         # Fall back to standard index
         working_idx = _generate_working_index(
-            working_txt, conversations=selected_convs, topics=topics
+            working_txt, conversations=selected_convs, topics=topics, fields=fields
         )
 
-    # Build final output: index + coverage + content + appendix (once, at end)
-    final_txt = "".join(working_idx)
+    # Build final output: index + coverage + content + appendix (once, at end),
+    # joined once rather than grown with repeated `+=` copies.
+    parts = list(working_idx)
     if coverage_report:
-        final_txt += "\n" + "\n".join(coverage_report)
-    final_txt += "\n" + working_txt
-
-    # Emit appendix ONCE at the very end if artifacts exist
+        parts.append("\n")
+        parts.append("\n".join(coverage_report))
+    parts.append("\n")
+    parts.append(working_txt)
+
+    # Emit appendix ONCE at the very end if artifacts exist. This is the only
+    # place the header is written: `_strip_existing_appendix` and
+    # `extract_research_artifacts` already removed any header lines from the
+    # content, so no dedupe pass over the finished text is needed.
     if artifacts_list:
-        final_txt += (
-            "\n\n" + "=" * 70 + "\n"
+        rule = "=" * 70
+        parts.append(
+            f"\n\n{rule}\n"
             "APPENDIX: RESEARCH LOG & TOOL ARTIFACTS\n"
-            "=" * 70 + "\n\n"
+            f"{rule}\n\n"
             "This section contains metadata, tool-call fragments, and provenance\n"
             "information from the research extraction process.\n\n"
-            + "\n\n".join(artifacts_list)
         )
+        parts.append("\n\n".join(artifacts_list))
+    return "".join(parts), append_expected
+
+
+def _write_markdown_group(
+    w: Callable[[str], Any],
+    items: List[Dict[str, Any]],
+    *,
+    mode: str,
+    context: int,
+    topic_re: TopicPattern,
+) -> None:
+    """Emit one thread (root conversation plus its branches) through `w`."""
+    topic_hits: Dict[str, bool] = {}
+    root_item = items[0]
+    root_id = root_item["id"]
+    root_title = root_item["title"] or "Untitled"
+    w(f"## Thread: {root_title}\n\n")
+    w(f"- root_id: {root_id}\n")
+    w(f"- conversation_create_time: {ts_to_local_str(root_item['ctime'])}\n\n")
+
+    root_msgs = root_item["msgs"]
+    if mode == "excerpts":
+        root_msgs = excerpt_messages(root_msgs, topic_re, context, topic_hits)
+
+    if root_msgs:
+        w("### Root conversation\n\n")
+        for m in root_msgs:
+            w(f"**{m.role}** ({ts_to_local_str(m.t)})\n\n{m.text}\n\n")
+    else:
+        w(
+            "_No matching excerpts in root conversation._\n\n"
+            if mode == "excerpts"
+            else "_No messages found._\n\n"
+        )
+
+    for b in items[1:]:
+        b_id = b["id"]
+        b_title = b["title"] or "Untitled"
+        b_msgs_new = trim_branch_new_part(root_item["msgs"], b["msgs"])
 
-    # Final safety: ensure appendix header appears only once
-    final_txt = _dedupe_appendix_header(final_txt)
-    return final_txt, append_expected
+        if mode == "excerpts":
+            b_msgs_new = excerpt_messages(b_msgs_new, topic_re, context, topic_hits)
+
+        w(f"### Branch: {b_title}\n\n")
+        w(f"- branch_id: {b_id}\n")
+        w(f"- branch_conversation_create_time: {ts_to_local_str(b['ctime'])}\n\n")
+
+        if b_msgs_new:
+            for m in b_msgs_new:
+                w(f"**{m.role}** ({ts_to_local_str(m.t)})\n\n{m.text}\n\n")
+        else:
+            w(
+                "_No matching excerpts in this branch._\n\n"
+                if mode == "excerpts"
+                else "_No new messages after trimming._\n\n"
+            )
+
+    w("---\n\n")
+
+
+def _render_markdown_group(
+    items: List[Dict[str, Any]], *, mode: str, context: int, topic_re: TopicPattern
+) -> str:
+    """Render one thread to a string; the unit of work for the dossier pool."""
+    buf = io.StringIO()
+    _write_markdown_group(
+        buf.write, items, mode=mode, context=context, topic_re=topic_re
+    )
+    return buf.getvalue()
+
+
+def _write_markdown_dossier(
+    w: Callable[[str], Any],
+    *,
+    topic_label: str,
+    root: Path,
+    mode: str,
+    context: int,
+    topic_re: TopicPattern,
+    group_order: List[Tuple[str, List[Dict[str, Any]]]],
+    workers: int = 1,
+) -> None:
+    """Emit the markdown dossier through `w` (a file or buffer `write`).
+
+    With `workers > 1`, threads are rendered in a process pool and written in
+    their original order. Each thread's messages are pickled to a worker, which
+    costs about as much as rendering them, so this only pays off for dossiers
+    with many large threads on many-core machines.
+    """
+    w(f"# Dossier: {topic_label}\n\n")
+    w(f"- generated_at: {ts_to_local_str(datetime.now(tz=timezone.utc).timestamp())}\n")
+    w(f"- export_root: {root}\n")
+    w(f"- mode: {mode}\n\n")
+    w("---\n\n")
+
+    if workers <= 1:
+        for _, items in group_order:
+            _write_markdown_group(
+                w, items, mode=mode, context=context, topic_re=topic_re
+            )
+        return
+    render = partial(
+        _render_markdown_group, mode=mode, context=context, topic_re=topic_re
+    )
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for rendered in ex.map(render, [items for _, items in group_order]):
+            w(rendered)
 
 
 def build_combined_dossier(
@@ -186,11 +339,17 @@ def build_combined_dossier(
     used_links_file: Optional[str] = None,
     config_file: Optional[str] = None,
     name: Optional[str] = None,
+    fields: Optional[ConversationFields] = None,
 ) -> Path:
     if not wanted_ids:
         die("No valid selections provided; cannot build dossier.")
+    # Reuse the caller's per-run field memo (selection already filled it).
+    if fields is None:
+        fields = ConversationFields()
 
-    by_id = build_conversation_map_by_id(convs)
+    # Normalized text is only reused within one dossier; don't carry it over.
+    normalize_text.cache_clear()
+    by_id = build_conversation_map_by_id(convs, wanted_ids, fields)
 
     missing = [i for i in wanted_ids if i not in by_id]
     if missing:
@@ -202,8 +361,8 @@ def build_combined_dossier(
     convo_items = []
     for cid in wanted_ids:
         c = by_id[cid]
-        _, title = conv_id_and_title(c)
-        ctime = coerce_create_time(c.get("create_time"))
+        _, title = fields.meta(c)
+        ctime = fields.ctime(c)
         msgs = extract_messages_best_effort(c)
         convo_items.append(
             {
@@ -246,67 +405,6 @@ def build_combined_dossier(
         out_name = f"dossier__{safe_slug(topic_label)}__{timestamp.replace('-', '')}.md"
         out_path = dossiers_dir / out_name
 
-    doc: List[str] = []
-    doc.append(f"# Dossier: {topic_label}\n\n")
-    doc.append(
-        f"- generated_at: {ts_to_local_str(datetime.now(tz=timezone.utc).timestamp())}\n"
-    )
-    doc.append(f"- export_root: {root}\n")
-    doc.append(f"- mode: {mode}\n\n")
-    doc.append("---\n\n")
-
-    for _, items in group_order:
-        root_item = items[0]
-        root_id = root_item["id"]
-        root_title = root_item["title"] or "Untitled"
-        doc.append(f"## Thread: {root_title}\n\n")
-        doc.append(f"- root_id: {root_id}\n")
-        doc.append(
-            f"- conversation_create_time: {ts_to_local_str(root_item['ctime'])}\n\n"
-        )
-
-        root_msgs = root_item["msgs"]
-        if mode == "excerpts":
-            root_msgs = excerpt_messages(root_msgs, topic_re, context)
-
-        if root_msgs:
-            doc.append("### Root conversation\n\n")
-            for m in root_msgs:
-                doc.append(f"**{m.role}** ({ts_to_local_str(m.t)})\n\n{m.text}\n\n")
-        else:
-            doc.append(
-                "_No matching excerpts in root conversation._\n\n"
-                if mode == "excerpts"
-                else "_No messages found._\n\n"
-            )
-
-        for b in items[1:]:
-            b_id = b["id"]
-            b_title = b["title"] or "Untitled"
-            b_msgs_new = trim_branch_new_part(root_item["msgs"], b["msgs"])
-
-            if mode == "excerpts":
-                b_msgs_new = excerpt_messages(b_msgs_new, topic_re, context)
-
-            doc.append(f"### Branch: {b_title}\n\n")
-            doc.append(f"- branch_id: {b_id}\n")
-            doc.append(
-                f"- branch_conversation_create_time: {ts_to_local_str(b['ctime'])}\n\n"
-            )
-
-            if b_msgs_new:
-                for m in b_msgs_new:
-                    doc.append(f"**{m.role}** ({ts_to_local_str(m.t)})\n\n{m.text}\n\n")
-            else:
-                doc.append(
-                    "_No matching excerpts in this branch._\n\n"
-                    if mode == "excerpts"
-                    else "_No new messages after trimming._\n\n"
-                )
-
-        doc.append("---\n\n")
-
-    md_content = "".join(doc)
     # Normalize requested formats: default to ['txt'] when not provided
     req_formats = [f.lower() for f in (formats or [])]
     if not req_formats:
@@ -338,14 +436,40 @@ def build_combined_dossier(
                 by_id=by_id,
                 wanted_ids=wanted_ids,
                 topics=topics,
+                fields=fields,
             )
         except Exception as e:
             die(f"Working TXT processing failed: {e}")
 
+    def _emit_markdown(w: Callable[[str], Any]) -> None:
+        _write_markdown_dossier(
+            w,
+            topic_label=topic_label,
+            root=root,
+            mode=mode,
+            context=context,
+            topic_re=topic_re,
+            group_order=group_order,
+            workers=DOSSIER_WORKERS,
+        )
+
+    # The markdown document is only rendered for formats that use it. MD alone
+    # streams straight to the file; DOCX needs the full text for plain-text
+    # conversion, so it is rendered once into a buffer and shared with MD.
+    md_content: Optional[str] = None
+    if "docx" in req_formats:
+        buf = io.StringIO()
+        _emit_markdown(buf.write)
+        md_content = buf.getvalue()
+
     # Write MD if requested
     if "md" in req_formats:
         try:
-            md_path.write_text(md_content, encoding="utf-8")
+            if md_content is not None:
+                md_path.write_text(md_content, encoding="utf-8")
+            else:
+                with md_path.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+                    _emit_markdown(fh.write)
             created_primary = md_path
         except Exception as e:
             print(f"WARNING: MD generation failed: {e}", file=sys.stderr)
@@ -370,10 +494,8 @@ def build_combined_dossier(
                 # in normal transcript content.
                 if append_expected:
                     appendix_header_marker = "APPENDIX: RESEARCH LOG & TOOL ARTIFACTS"
-                    appendix_header_count = sum(
-                        1
-                        for line in working_txt.splitlines()
-                        if line.strip() == appendix_header_marker
+                    appendix_header_count = _count_exact_lines(
+                        working_txt, appendix_header_marker
                     )
                     if appendix_header_count != 1:
                         print(
@@ -392,7 +514,7 @@ def build_combined_dossier(
 
             docx_path = out_path.with_suffix(".docx")
             docx_doc = Document()
-            plain = markdown_to_plain_text(md_content)
+            plain = markdown_to_plain_text(md_content or "")
             for para in [p for p in plain.split("\n\n") if p.strip()]:
                 docx_doc.add_paragraph(para)
             docx_doc.save(str(docx_path))
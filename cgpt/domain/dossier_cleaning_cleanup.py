@@ -1,8 +1,148 @@
+import io
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from cgpt.core.io import normalize_text
 
+# High-confidence tool/runtime keys only. Keep this list narrow to avoid
+# stripping legitimate transcript JSON content.
+_TOOL_KEYS = (
+    "search_query",
+    "image_query",
+    "open",
+    "click",
+    "find",
+    "screenshot",
+    "response_length",
+    "tool_uses",
+    "recipient_name",
+    "parameters",
+    "tool_call",
+    "task_violates_safety_guidelines",
+)
+
+# The cleaner passes below run one after another, in this order: a removal can
+# join text and so create or break a match for a later pattern (`^` anchors,
+# `\b`/`(?!\S)` boundaries, tags split by private-use spans).
+_RE_TOOL_JSON_OBJECT = re.compile(
+    r"\{\s*['\"]?(?:" + "|".join(_TOOL_KEYS) + r")[\'\"]?.*?\}", re.DOTALL
+)
+_RE_TOOL_CALL_MARKER = re.compile(r"\[tool_call:.*?\]", re.DOTALL)
+_RE_TOOL_PAREN_LINE = re.compile(r"^\s*(?:\*\*)?tool\s*\(.*", re.MULTILINE)
+_RE_TOOL_WORD_LINE = re.compile(r"^\s*(?:\*\*)?tool\s+\w+.*", re.MULTILINE)
+_RE_TOOL_STATUS = re.compile(
+    r"(?:Successfully created|Successfully updated|Failed with error).*?\n"
+)
+# One pass for the three instruction headings: each block runs up to the next
+# `## ` heading, so removing one never changes where another starts or ends.
+_RE_TOOL_INSTRUCTION_BLOCK = re.compile(
+    r"^##\s+(?:How to invoke the file_search tool"
+    r"|How to handle results from file_search"
+    r"|Tool usage instructions).*?(?=^##\s|\Z)",
+    re.DOTALL | re.MULTILINE | re.IGNORECASE,
+)
+_RE_TRUNCATED_NOTICE = re.compile(
+    r"^The file is too long and its contents have been truncated\..*?$",
+    re.MULTILINE | re.IGNORECASE,
+)
+_RE_ZERO_WIDTH = re.compile(r"[\u200b-\u200f\u2060\ufeff]")
+_TASK_SAFETY_KEY = "task_violates_safety_guidelines"
+_RE_JSON_TOOL_CALL_LABEL = re.compile(
+    r"\[\s*JSON\s*/\s*Tool\s*Call\s*\]", re.IGNORECASE
+)
+
+_RE_CITETURN_TAG = re.compile(r"<citeturn[^>]*>", re.IGNORECASE)
+_RE_NAVLIST = re.compile(r"<navlist>.*?</navlist>", re.DOTALL | re.IGNORECASE)
+_RE_TURN_NEWS_TOKEN = re.compile(r"\bturn\d+news\d+\b", re.IGNORECASE)
+_RE_LONE_CITATION_BRACKET = re.compile(r"\[\d+\](?!\S)")
+# Also covers the phantom 【…†L…】 markers: both end at the first 】.
+_RE_CJK_BRACKET_BLOCK = re.compile(r"【[^】]*】")
+_RE_REF_REMOVED = re.compile(r"\[REF REMOVED\]", re.IGNORECASE)
+
+_RE_MARKUP_TAG = re.compile(r"</?[a-zA-Z][^>]*/?>\s*")
+_RE_SPAN_BLOCK = re.compile(r"<span[^>]*>.*?</span>", re.DOTALL)
+_RE_STRAY_APPENDIX_HEADER = re.compile(
+    r"APPENDIX:\s*RESEARCH LOG & TOOL ARTIFACTS\s*", re.IGNORECASE
+)
+_RE_PRIVATE_USE_SPAN = re.compile(r"[\ue000-\uf8ff].*?[\ue000-\uf8ff]", re.DOTALL)
+# Stray private-use markers and non-printing artifacts (soft hyphen,
+# replacement, noncharacter): single-character removals, so one pass.
+_RE_MARKUP_CHARS = re.compile(r"[\ue000-\uf8ff\u00ad\ufffd\ufffe]")
+_RE_TURN_TOKEN = re.compile(
+    r"(?:cite)?turn\d+(?:search|news|view|file)\w*", re.IGNORECASE
+)
+_RE_CITETURN_WORD = re.compile(r"\bciteturn\d+\w+\b", re.IGNORECASE)
+_RE_SEPARATOR_LINE = re.compile(r"^={60,}.*?$", re.MULTILINE)
+
+# ASCII bytes that are not letters; with non-ASCII dropped by encode(), deleting
+# these leaves exactly the [A-Za-z] characters of a line.
+_ASCII_NON_LETTERS = bytes(c for c in range(128) if not chr(c).isalpha())
+_APPENDIX_WORD = b"APPENDIX"
+_APPENDIX_TITLE = b"RESEARCHLOGTOOLARTIFACTS"
+
+# Lines quarantined by extract_research_artifacts, checked in order.
+# Each pattern is a literal opener, a lazy body, and an optional literal closer.
+# A pattern matches iff its first opener is followed somewhere by the closer, and
+# then the match starts at that opener. Checking this with find/rfind first keeps
+# a line with many unclosed openers (e.g. a run of "{") from making the lazy
+# scan retry at every opener, which is quadratic in the line length.
+_ARTIFACT_PATTERNS = [
+    (opener, closer, re.compile(pattern, re.DOTALL), label)
+    for opener, closer, pattern, label in (
+        (
+            "[Search Query]",
+            None,
+            r"\[Search Query\].*?(?=\n\n|\n[A-Z]|$)",
+            "Search Fragment",
+        ),
+        ("[JSON/Tool Call]", None, r"\[JSON/Tool Call\].*", "JSON/Tool Call"),
+        ("{", "}", r"\{.*?\}", "JSON/Tool Call"),
+        ("[Image", "]", r"\[Image.*?\]", "Image Reference"),
+        ("[GPT Model", "]", r"\[GPT Model.*?\]", "Model Info"),
+        ("[Citation Widget", "]", r"\[Citation Widget.*?\]", "Citation Widget"),
+    )
+]
+# A quoted tool key used as a JSON field name, e.g. `"search_query":`.
+_RE_TOOL_JSON_FIELD = re.compile(
+    r"[\"'](?:" + "|".join(map(re.escape, _TOOL_KEYS)) + r")[\"']\s*:", re.IGNORECASE
+)
+
+_RE_SPACE_RUN = re.compile(r" {2,}")
+_RE_BLANK_LINE_RUN = re.compile(r"\n{3,}")
+
+
+def _collapse_whitespace(text: str) -> str:
+    """Collapse space runs to one space and 3+ newlines to a blank line."""
+    # A substring probe is far cheaper than a regex scan that finds nothing.
+    if "  " in text:
+        text = _RE_SPACE_RUN.sub(" ", text)
+    if "\n\n\n" in text:
+        text = _RE_BLANK_LINE_RUN.sub("\n\n", text)
+    return text
+
+
+def _drop_tool_json_lines(text: str) -> str:
+    """Drop JSON/tool-call annotation lines and tool-key JSON lines."""
+    lines = text.split("\n")
+    cleaned_lines = []
+    for line in lines:
+        stripped = line.strip()
+        normalized = _RE_ZERO_WIDTH.sub("", stripped)
+        # Skip JSON/Tool Call annotation lines outright
+        if _RE_JSON_TOOL_CALL_LABEL.search(normalized):
+            continue
+        # Skip JSON blocks with tool/system keys
+        if normalized.startswith("{") and any(key in normalized for key in _TOOL_KEYS):
+            continue
+        # Skip lines with embedded JSON containing explicit safety/task fields.
+        if any(
+            f'"{key}"' in normalized or f"'{key}'" in normalized
+            for key in [_TASK_SAFETY_KEY]
+        ):
+            continue
+        cleaned_lines.append(line)
+    return "\n".join(cleaned_lines)
+
 
 def _strip_tool_noise(text: str) -> str:
     """Remove tool-call JSON blocks and other technical noise.
@@ -14,90 +154,44 @@ def _strip_tool_noise(text: str) -> str:
       Tool creation/update messages
       Meta-prompt instructions
     """
-    # High-confidence tool/runtime keys only. Keep this list narrow to avoid
-    # stripping legitimate transcript JSON content.
-    tool_keys = [
-        "search_query",
-        "image_query",
-        "open",
-        "click",
-        "find",
-        "screenshot",
-        "response_length",
-        "tool_uses",
-        "recipient_name",
-        "parameters",
-        "tool_call",
-        "task_violates_safety_guidelines",
-    ]
+    # Each pass below is skipped when a substring probe proves it cannot match;
+    # case-insensitive probes use casefold() so they stay a superset of re.I.
 
     # Remove complete JSON objects that contain tool-related keys
-    pattern = r"\{\s*['\"]?(?:" + "|".join(tool_keys) + r")[\'\"]?.*?\}"
-    text = re.sub(pattern, "", text, flags=re.DOTALL)
+    if "{" in text:
+        text = _RE_TOOL_JSON_OBJECT.sub("", text)
 
     # Remove tool call markers
-    text = re.sub(r"\[tool_call:.*?\]", "", text, flags=re.DOTALL)
+    if "[tool_call:" in text:
+        text = _RE_TOOL_CALL_MARKER.sub("", text)
 
     # Remove lines starting with 'tool' or '**tool**'
-    text = re.sub(r"^\s*(?:\*\*)?tool\s*\(.*", "", text, flags=re.MULTILINE)
-    text = re.sub(r"^\s*(?:\*\*)?tool\s+\w+.*", "", text, flags=re.MULTILINE)
+    if "tool" in text:
+        text = _RE_TOOL_PAREN_LINE.sub("", text)
+        text = _RE_TOOL_WORD_LINE.sub("", text)
 
     # Remove tool creation/update messages
-    text = re.sub(
-        r"(?:Successfully created|Successfully updated|Failed with error).*?\n",
-        "",
-        text,
-    )
+    if "Successfully " in text or "Failed with error" in text:
+        text = _RE_TOOL_STATUS.sub("", text)
 
     # Remove tool usage boilerplate/instruction blocks that leak into transcripts
-    text = re.sub(
-        r"^##\s+How to invoke the file_search tool.*?(?=^##\s|\Z)",
-        "",
-        text,
-        flags=re.DOTALL | re.MULTILINE | re.IGNORECASE,
-    )
-    text = re.sub(
-        r"^##\s+How to handle results from file_search.*?(?=^##\s|\Z)",
-        "",
-        text,
-        flags=re.DOTALL | re.MULTILINE | re.IGNORECASE,
-    )
-    text = re.sub(
-        r"^##\s+Tool usage instructions.*?(?=^##\s|\Z)",
-        "",
-        text,
-        flags=re.DOTALL | re.MULTILINE | re.IGNORECASE,
-    )
-    text = re.sub(
-        r"^The file is too long and its contents have been truncated\..*?$",
-        "",
-        text,
-        flags=re.MULTILINE | re.IGNORECASE,
-    )
+    if "##" in text:
+        text = _RE_TOOL_INSTRUCTION_BLOCK.sub("", text)
+    if "truncated." in text.casefold():
+        text = _RE_TRUNCATED_NOTICE.sub("", text)
 
     # Remove lines that are pure JSON (start with { and contain tool keys)
-    lines = text.split("\n")
-    cleaned_lines = []
-    for line in lines:
-        stripped = line.strip()
-        normalized = re.sub(r"[\u200b-\u200f\u2060\ufeff]", "", stripped)
-        # Skip JSON/Tool Call annotation lines outright
-        if re.search(r"\[\s*JSON\s*/\s*Tool\s*Call\s*\]", normalized, re.IGNORECASE):
-            continue
-        # Skip JSON blocks with tool/system keys
-        if normalized.startswith("{") and any(key in normalized for key in tool_keys):
-            continue
-        # Skip lines with embedded JSON containing explicit safety/task fields.
-        if any(
-            f'"{key}"' in normalized or f"'{key}'" in normalized
-            for key in ["task_violates_safety_guidelines"]
-        ):
-            continue
-        cleaned_lines.append(line)
-    text = "\n".join(cleaned_lines)
+    if (
+        "{" in text
+        or "[" in text
+        or _TASK_SAFETY_KEY in text
+        or _RE_ZERO_WIDTH.search(text)
+    ):
+        text = _drop_tool_json_lines(text)
 
     # Remove excessive blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    if "\n\n\n" in text:
+        text = _RE_BLANK_LINE_RUN.sub("\n\n", text)
     return text.strip()
 
 
@@ -111,28 +205,29 @@ def _strip_citation_markers(text: str) -> str:
       - Citation reference artifacts
       - Internal phantom citation markers: 【…†L…】
     """
-    # Remove <citeturn...> tags
-    text = re.sub(r"<citeturn[^>]*>", "", text, flags=re.IGNORECASE)
-
-    # Remove <navlist>...</navlist> blocks
-    text = re.sub(r"<navlist>.*?</navlist>", "", text, flags=re.DOTALL | re.IGNORECASE)
+    # Remove <citeturn...> tags and <navlist>...</navlist> blocks
+    if "<" in text:
+        text = _RE_CITETURN_TAG.sub("", text)
+        text = _RE_NAVLIST.sub("", text)
 
     # Remove bare turn0newsXX tokens
-    text = re.sub(r"\bturn\d+news\d+\b", "", text, flags=re.IGNORECASE)
+    if "turn" in text.casefold():
+        text = _RE_TURN_NEWS_TOKEN.sub("", text)
 
     # Remove citation brackets like [1], [2] that appear alone
-    text = re.sub(r"\[\d+\](?!\S)", "", text)
+    if "[" in text:
+        text = _RE_LONE_CITATION_BRACKET.sub("", text)
 
-    # Remove internal phantom citation markers: 【…†L…】 or similar CJK bracket patterns
-    text = re.sub(r"【[^】]*†[^】]*】", "", text)
-    text = re.sub(r"【[^】]*】", "", text)  # Remove other 【】 blocks
+    # Remove internal phantom citation markers (【…†L…】) and other 【】 blocks
+    if "【" in text:
+        text = _RE_CJK_BRACKET_BLOCK.sub("", text)
 
     # Remove residual ref placeholders
-    text = re.sub(r"\[REF REMOVED\]", "", text, flags=re.IGNORECASE)
+    if "[" in text:
+        text = _RE_REF_REMOVED.sub("", text)
 
     # Clean up excessive whitespace from removals
-    text = re.sub(r" {2,}", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _collapse_whitespace(text)
 
     return text.strip()
 
@@ -148,74 +243,79 @@ def _sanitize_openai_markup(text: str) -> str:
       - Other angle-bracket UI markup (generic)
       - Stray appendix headers (to prevent duplication)
     """
-    # Remove self-closing angle-bracket tags: <tag.../> or <tag>
-    text = re.sub(r"</?[a-zA-Z][^>]*/?>\s*", "", text)
-
-    # Remove any remaining OpenAI-style span markers (often empty or metadata)
-    text = re.sub(r"<span[^>]*>.*?</span>", "", text, flags=re.DOTALL)
+    # Remove self-closing angle-bracket tags: <tag.../> or <tag>, then any
+    # OpenAI-style span blocks those removals leave behind
+    if "<" in text:
+        text = _RE_MARKUP_TAG.sub("", text)
+        if "<span" in text:
+            text = _RE_SPAN_BLOCK.sub("", text)
 
     # Remove stray "APPENDIX" headers to prevent duplication
     # (the real header will be emitted once by the pipeline)
-    text = re.sub(
-        r"APPENDIX:\s*RESEARCH LOG & TOOL ARTIFACTS\s*",
-        "",
-        text,
-        flags=re.IGNORECASE,
-    )
-
-    # Remove private-use markers and spans bounded by them
-    text = re.sub(r"[\ue000-\uf8ff].*?[\ue000-\uf8ff]", "", text, flags=re.DOTALL)
-    text = re.sub(r"[\ue000-\uf8ff]", "", text)
+    if "&" in text:
+        text = _RE_STRAY_APPENDIX_HEADER.sub("", text)
 
-    # Remove common non-printing artifacts (replacement/noncharacter/soft hyphen)
-    text = re.sub(r"[\u00ad\ufffd\ufffe]", "", text)
+    # Remove private-use markers, spans bounded by them, and non-printing artifacts
+    if _RE_MARKUP_CHARS.search(text):
+        text = _RE_PRIVATE_USE_SPAN.sub("", text)
+        text = _RE_MARKUP_CHARS.sub("", text)
 
     # Remove turn/citeturn tokens if any remain
-    text = re.sub(
-        r"(?:cite)?turn\d+(?:search|news|view|file)\w*",
-        "",
-        text,
-        flags=re.IGNORECASE,
-    )
-    text = re.sub(r"\bciteturn\d+\w+\b", "", text, flags=re.IGNORECASE)
+    if "turn" in text.casefold():
+        text = _RE_TURN_TOKEN.sub("", text)
+        text = _RE_CITETURN_WORD.sub("", text)
 
     # Remove separator lines often associated with appendix (lines of = or -)
-    text = re.sub(r"^={60,}.*?$", "", text, flags=re.MULTILINE)
+    if "=" * 60 in text:
+        text = _RE_SEPARATOR_LINE.sub("", text)
 
     # Clean up whitespace damage from removals
-    text = re.sub(r" {2,}", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _collapse_whitespace(text)
 
     return text.strip()
 
 
 def _is_appendix_header_line(line: str) -> bool:
     """Detect appendix header lines robustly (ignores punctuation/soft hyphens)."""
-    normalized = re.sub(r"[^A-Za-z]", "", line).upper()
-    return "APPENDIX" in normalized and "RESEARCHLOGTOOLARTIFACTS" in normalized
+    if len(line) < len(_APPENDIX_WORD) + len(_APPENDIX_TITLE):
+        return False
+    letters = line.encode("ascii", "ignore").translate(None, _ASCII_NON_LETTERS)
+    normalized = letters.upper()
+    return _APPENDIX_WORD in normalized and _APPENDIX_TITLE in normalized
 
 
 def _strip_existing_appendix(text: str) -> str:
-    """Remove any existing appendix block to prevent duplication."""
-    lines = text.split("\n")
-    for idx, line in enumerate(lines):
+    """Remove any existing appendix block to prevent duplication.
+
+    Everything from the first appendix header line on is dropped, so the result
+    never contains a header line (no `_remove_appendix_header_lines` needed).
+    """
+    offset = 0
+    for line in text.split("\n"):
         if _is_appendix_header_line(line):
-            return "\n".join(lines[:idx]).rstrip()
+            return text[:offset].rstrip()
+        offset += len(line) + 1
     return text
 
 
 def _dedupe_appendix_header(text: str) -> str:
-    """Ensure appendix header appears only once, preserving content."""
+    """Ensure appendix header appears only once, preserving content.
+
+    NOTE: The dossier pipeline no longer calls this; the appendix header is
+    emitted once. Kept only for the `dossier_cleaning.__all__` compatibility
+    surface.
+    """
     marker = "APPENDIX: RESEARCH LOG & TOOL ARTIFACTS"
-    if marker not in text:
+    first = text.find(marker)
+    if first < 0:
         return text
-    parts = text.split(marker)
-    if len(parts) <= 2:
+    second = text.find(marker, first + len(marker))
+    if second < 0:
         return text
-    # Keep first marker and remove subsequent marker occurrences
-    first = parts[0] + marker + parts[1]
-    rest = "".join(parts[2:]).replace(marker, "")
-    return first + rest
+    # Keep first marker and remove subsequent marker occurrences. The second
+    # replace catches a marker that the first one's removals stitched together.
+    rest = text[second:].replace(marker, "").replace(marker, "")
+    return text[:second] + rest
 
 
 def _remove_appendix_header_lines(text: str) -> str:
@@ -241,25 +341,40 @@ def _deduplicate_blocks(text: str, min_block_size: int = 200) -> str:
     """Remove duplicate blocks of text (e.g., repeated transcripts).
 
     Uses hash-based deduplication. Splits text by paragraphs and removes
-    consecutive blocks that are similar (hash match).
+    blocks whose whitespace-normalized text was already seen. Blank-line
+    boundaries are content-defined, so an edit inside one block never shifts
+    the boundaries of the blocks after it; a repeated transcript with a small
+    change still has every untouched paragraph removed.
     """
-    paragraphs = text.split("\n\n")
-    seen_hashes = {}
-    deduplicated = []
-
-    for para in paragraphs:
-        if len(para) < min_block_size:
-            # Keep small blocks (headers, short messages)
-            deduplicated.append(para)
-        else:
-            # Hash larger blocks for deduplication
-            para_hash = hash(normalize_text(para))
-            if para_hash not in seen_hashes:
-                seen_hashes[para_hash] = True
-                deduplicated.append(para)
-            # else: skip duplicate
-
-    return "\n\n".join(deduplicated)
+    # Keyed by the normalized text itself: str caches its hash, and set lookups
+    # confirm equality, so distinct blocks can never collide.
+    seen: Set[str] = set()
+    # Walk the paragraphs with find() and write survivors straight to a buffer,
+    # rather than holding a list of every paragraph plus a filtered copy.
+    buf = io.StringIO()
+    w = buf.write
+    wrote_any = False
+    start = 0
+    while True:
+        end = text.find("\n\n", start)
+        para = text[start:] if end < 0 else text[start:end]
+        # Keep small blocks (headers, short messages); skip repeated large ones
+        if len(para) >= min_block_size:
+            key = normalize_text(para)
+            if key in seen:
+                para = None
+            else:
+                seen.add(key)
+        if para is not None:
+            if wrote_any:
+                w("\n\n")
+            w(para)
+            wrote_any = True
+        if end < 0:
+            break
+        start = end + 2
+
+    return buf.getvalue()
 
 
 def _extract_deliverables(text: str, patterns: Optional[List[str]] = None) -> str:
@@ -279,6 +394,8 @@ def _extract_deliverables(text: str, patterns: Optional[List[str]] = None) -> st
             "deliverable",
         ]
 
+    patterns_lower = [p.lower() for p in patterns]
+
     lines = text.split("\n")
     deliverables = []
     in_section = False
@@ -288,7 +405,7 @@ def _extract_deliverables(text: str, patterns: Optional[List[str]] = None) -> st
         line_lower = line.lower()
 
         # Check if line matches any pattern (start of a deliverable)
-        matches_pattern = any(p.lower() in line_lower for p in patterns)
+        matches_pattern = any(p in line_lower for p in patterns_lower)
 
         if matches_pattern:
             # Save previous section if any
@@ -323,48 +440,27 @@ def extract_research_artifacts(text: str) -> Tuple[str, List[str]]:
     artifacts = []
     cleaned_lines = []
 
-    # Patterns to detect and quarantine
-    artifact_patterns = [
-        (r"\[Search Query\].*?(?=\n\n|\n[A-Z]|$)", "Search Fragment"),
-        (r"\[JSON/Tool Call\].*", "JSON/Tool Call"),
-        (r"\{.*?\}", "JSON/Tool Call"),
-        (r"\[Image.*?\]", "Image Reference"),
-        (r"\[GPT Model.*?\]", "Model Info"),
-        (r"\[Citation Widget.*?\]", "Citation Widget"),
-    ]
-
-    tool_json_keys = [
-        "search_query",
-        "image_query",
-        "open",
-        "click",
-        "find",
-        "screenshot",
-        "response_length",
-        "task_violates_safety_guidelines",
-        "tool_call",
-        "tool_uses",
-        "recipient_name",
-        "parameters",
-    ]
-
     lines = text.split("\n")
     for _i, line in enumerate(lines):
-        normalized_line = re.sub(r"[\u200b-\u200f\u2060\ufeff]", "", line)
+        normalized_line = _RE_ZERO_WIDTH.sub("", line)
         # Skip lines that are stray appendix headers
         if _is_appendix_header_line(normalized_line):
             continue
 
         # Always drop JSON/Tool Call lines (do not propagate to appendix)
-        if re.search(
-            r"\[\s*JSON\s*/\s*Tool\s*Call\s*\]", normalized_line, re.IGNORECASE
-        ):
+        if _RE_JSON_TOOL_CALL_LABEL.search(normalized_line):
             continue
 
         found_artifact = False
 
-        for pattern, label in artifact_patterns:
-            match = re.search(pattern, normalized_line, re.DOTALL)
+        for opener, closer, pattern, label in _ARTIFACT_PATTERNS:
+            start = normalized_line.find(opener)
+            if start < 0 or (
+                closer is not None
+                and normalized_line.rfind(closer) < start + len(opener)
+            ):
+                continue
+            match = pattern.search(normalized_line, start)
             if match:
                 artifact_text = match.group(0)[:200]
                 # Avoid propagating appendix header text into artifacts
@@ -373,14 +469,7 @@ def extract_research_artifacts(text: str) -> Tuple[str, List[str]]:
                     break
                 # Always drop JSON/Tool Call lines (do not propagate to appendix)
                 if label == "JSON/Tool Call":
-                    if not any(
-                        re.search(
-                            rf'["\']{re.escape(k)}["\']\s*:',
-                            artifact_text,
-                            re.IGNORECASE,
-                        )
-                        for k in tool_json_keys
-                    ):
+                    if not _RE_TOOL_JSON_FIELD.search(artifact_text):
                         # Keep ordinary JSON content that does not look like tool metadata.
                         continue
                     found_artifact = True
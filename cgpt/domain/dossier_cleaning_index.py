@@ -1,15 +1,33 @@
+import heapq
 import re
+import time
+from operator import itemgetter
 from typing import Any, Dict, List, Optional, Tuple
 
-from cgpt.core.io import coerce_create_time, ts_to_local_date_str, ts_to_local_str
-from cgpt.domain.config_schema import _get_short_tag, matches_thread_filter
-from cgpt.domain.conversations import conv_id_and_title
+from cgpt.core.io import ts_to_local_date_str, ts_to_local_str
+from cgpt.domain.config_schema import _get_short_tag, compile_thread_filter
+from cgpt.domain.conversations import ConversationFields
+
+_RE_NUMBERED_LINE = re.compile(r"\d+\.")
+
+# Generic priority keywords (project/deliverable focused)
+_PRIORITY_KEYWORDS = (
+    "draft",
+    "decision",
+    "deliverable",
+    "output",
+    "final",
+    "review",
+    "summary",
+    "analysis",
+)
 
 
 def _generate_working_index(
     text: str,
     conversations: Optional[List[Dict[str, Any]]] = None,
     topics: Optional[List[str]] = None,
+    fields: Optional[ConversationFields] = None,
 ) -> List[str]:
     """Auto-generate navigational index with timeline and priority threads.
 
@@ -17,21 +35,23 @@ def _generate_working_index(
       - Global timeline (conversations by date)
       - Priority threads (top 5 by recency + keywords)
       - Section headers for navigation
+
+    `fields` is the caller's per-run memo of conversation fields, if any.
     """
+    if fields is None:
+        fields = ConversationFields()
     index_lines = ["## WORKING INDEX\n\n"]
-    invalid_create_time = [0]
-
-    def _conv_ctime(conv: Dict[str, Any]) -> float:
-        return coerce_create_time(conv.get("create_time"), invalid_create_time)
+    # Coerce each create_time once; the timeline and the scorer share them.
+    ctimes = [fields.ctime(conv) for conv in conversations or ()]
 
     # Add global timeline if conversations provided
     if conversations:
         index_lines.append("### Timeline\n\n")
-        # Sort conversations by create_time
-        sorted_convs = sorted(conversations, key=_conv_ctime, reverse=True)
-        for conv in sorted_convs[:10]:  # Show latest 10
-            cid, title = conv_id_and_title(conv)
-            ctime = _conv_ctime(conv)
+        # Latest 10 by create_time (nlargest matches a stable reverse sort)
+        latest = heapq.nlargest(10, range(len(ctimes)), key=ctimes.__getitem__)
+        for i in latest:
+            cid, title = fields.meta(conversations[i])
+            ctime = ctimes[i]
             date_str = ts_to_local_date_str(ctime) if ctime else "Unknown"
             cid_label = f"{cid[:8]}..." if cid else "unknown"
             index_lines.append(f"  - {date_str}: {title} (ID: {cid_label})\n")
@@ -40,50 +60,42 @@ def _generate_working_index(
     # Add priority threads (based on keywords and recency)
     if conversations and topics:
         index_lines.append("### Priority Threads (Read These First)\n\n")
-        # Generic priority keywords (project/deliverable focused)
-        priority_keywords = [
-            "draft",
-            "decision",
-            "deliverable",
-            "output",
-            "final",
-            "review",
-            "summary",
-            "analysis",
-        ]
+        topics_lower = [topic.lower() for topic in topics]
+
+        # One clock read for the whole pass: every conversation is scored
+        # against the same "now", and older ones skip the boost arithmetic.
+        now = time.time()
+        recent_cutoff = now - 30 * 86400
 
         scored_convs = []
-        for conv in conversations:
-            cid, title = conv_id_and_title(conv)
+        for conv, ctime in zip(conversations, ctimes):
+            cid, title = fields.meta(conv)
             score = 0
-            title_lower = (title or "").lower()
+            title_lower = fields.title_lower(conv)
 
             # Score by keyword presence
-            for kw in priority_keywords:
+            for kw in _PRIORITY_KEYWORDS:
                 if kw in title_lower:
                     score += 2
 
             # Score by topic match
-            for topic in topics:
-                if topic.lower() in title_lower:
+            for topic in topics_lower:
+                if topic in title_lower:
                     score += 3
 
             # Boost recent conversations
-            ctime = _conv_ctime(conv)
-            if ctime:
+            if ctime and ctime > recent_cutoff:
                 # Conversations from last 30 days get boost
-                import time
-
-                days_ago = (time.time() - ctime) / 86400
-                if days_ago < 30:
-                    score += (30 - days_ago) / 10
+                days_ago = (now - ctime) / 86400
+                score += (30 - days_ago) / 10
 
             if score > 0:
                 scored_convs.append((score, cid, title, ctime))
 
-        # Sort by score and show top 5
-        scored_convs.sort(reverse=True, key=lambda x: x[0])
-        for i, (_score, _cid, title, ctime) in enumerate(scored_convs[:5], 1):
+        # Show top 5 by score; nlargest keeps sort's stable order for ties
+        # without sorting every scored conversation.
+        top = heapq.nlargest(5, scored_convs, key=itemgetter(0))
+        for i, (_score, _cid, title, ctime) in enumerate(top, 1):
             date_str = ts_to_local_date_str(ctime) if ctime else "Unknown"
             index_lines.append(f"  {i}. [{date_str}] {title}\n")
         index_lines.append("\n")
@@ -95,7 +107,7 @@ def _generate_working_index(
     # Find all section headers (##, ===, etc.)
     lines = text.split("\n")
     for i, line in enumerate(lines):
-        if line.startswith(("##", "===")) or re.match(r"^\d+\.", line):
+        if line.startswith(("##", "===")) or _RE_NUMBERED_LINE.match(line):
             section_num += 1
             header = line.strip().lstrip("#").strip().lstrip("=").strip()
             if header and header != "WORKING INDEX":  # Don't index ourselves
@@ -110,6 +122,7 @@ def _generate_working_index_with_tags(
     conversations: Optional[List[Dict[str, Any]]] = None,
     topics: Optional[List[str]] = None,
     config: Optional[Dict[str, Any]] = None,
+    fields: Optional[ConversationFields] = None,
 ) -> Tuple[List[str], List[str]]:
     """
     Generate working index with thread tags derived from config buckets.
@@ -117,6 +130,8 @@ def _generate_working_index_with_tags(
     """
     if not conversations:
         return [], []
+    if fields is None:
+        fields = ConversationFields()
 
     index_lines = ["PRIORITY THREADS (with category tags)\n", "=" * 70 + "\n"]
 
@@ -124,18 +139,20 @@ def _generate_working_index_with_tags(
     included_count = 0
     tag_counts: Dict[str, int] = {}  # Dynamic tag counting
 
+    thread_filter = compile_thread_filter(config) if config else None
+
     for c in conversations:
-        cid, title = conv_id_and_title(c)
+        cid, title = fields.meta(c)
         if cid and title:
             # Get tag from config if available
             bucket_tag = None
-            if config:
-                included, bucket_tag = matches_thread_filter(title, config)
+            if thread_filter is not None:
+                included, bucket_tag = thread_filter(title)
 
             # Map bucket name to short tag
             short_tag = _get_short_tag(bucket_tag)
 
-            ctime = coerce_create_time(c.get("create_time"))
+            ctime = fields.ctime(c)
             priority_threads.append((cid, title, ctime, short_tag))
             included_count += 1
             tag_counts[short_tag] = tag_counts.get(short_tag, 0) + 1
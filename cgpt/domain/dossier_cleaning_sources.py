@@ -1,31 +1,43 @@
+import io
 import re
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
-from cgpt.core.io import ts_to_local_str
+from cgpt.core.io import ts_to_local_date_str, ts_to_local_str
 
+# URL split into host and path groups in one scan; trailing punctuation is
+# trimmed from the match afterwards (a match must end on a non-punctuation
+# character).
+_RE_URL = re.compile(
+    r"https?://(?P<host>[^/?#\s\)\]\}\"\']*)(?P<path>[^?#\s\)\]\}\"\']*)[^\s\)\]\}\"\']*"
+)
+_URL_TRAILING_PUNCT = ".,;:!?"
 
 def _extract_sources(text: str) -> List[Tuple[str, str]]:
     """Extract URLs from text and return list of (url, normalized_label)."""
-    url_pattern = re.compile(r"https?://[^\s\)\]\}\"\']*[^\s\)\]\}\"\'\.,;:!?]")
-    matches = url_pattern.findall(text)
     unique = []
     seen = set()
-    for url in matches:
-        if url not in seen:
-            seen.add(url)
-            # normalize: remove common trailing punctuation
-            url = re.sub(r"[.,;:!?\'\"]$", "", url)
-            # generate label from domain + path
-            try:
-                from urllib.parse import urlparse
-
-                parsed = urlparse(url)
-                label = parsed.netloc + (parsed.path[:50] if parsed.path else "")
-            except Exception:
-                label = url[:60]
-            unique.append((url, label))
+    for m in _RE_URL.finditer(text):
+        url = m.group().rstrip(_URL_TRAILING_PUNCT)
+        # Trimming may reach back into the path or host.
+        keep = len(url) - (m.start("host") - m.start())
+        if keep <= 0 or url in seen:
+            continue
+        seen.add(url)
+        host = m.group("host")[:keep]
+        if "[" in host:
+            # unbalanced IPv6 bracket: no parseable netloc
+            label = url[:60]
+        else:
+            path = m.group("path")[: max(0, keep - len(host))]
+            if ";" in path:
+                # drop ";params" from the last segment, as urlparse does
+                cut = path.find(";", path.rfind("/"))
+                if cut >= 0:
+                    path = path[:cut]
+            label = host + path[:50]
+        unique.append((url, label))
     return unique
 
 
@@ -49,7 +61,7 @@ def _generate_toc(groups: Dict[str, List[Dict[str, Any]]]) -> List[str]:
             section_label += (
                 f" (+{branch_count} branch{'es' if branch_count != 1 else ''})"
             )
-        section_label += f" - {ts_to_local_str(create_time)[:10]}"
+        section_label += f" - {ts_to_local_date_str(create_time)}"
         toc.append(f"  {section_label}\n")
 
         # estimate lines per conversation: ~20-30 lines per branch, messages vary
@@ -81,25 +93,25 @@ def _build_clean_txt(
       - Sources registry at end
       - Minimal metadata header
     """
-    out: List[str] = []
+    buf = io.StringIO()
+    w = buf.write
     topic_label = ", ".join(topics) if topics else "Dossier"
 
     # === HEADER ===
-    out.append(f"DOSSIER: {topic_label}\n")
-    out.append(
-        f"Generated: {ts_to_local_str(datetime.now(tz=timezone.utc).timestamp())}\n"
-    )
-    out.append(f"Source: {root}\n")
-    out.append("\n")
+    w(f"DOSSIER: {topic_label}\n")
+    w(f"Generated: {ts_to_local_str(datetime.now(tz=timezone.utc).timestamp())}\n")
+    w(f"Source: {root}\n")
+    w("\n")
 
     # === TOC ===
     # Convert group_order back to dict format for TOC generation
     groups_dict = dict(group_order)
     toc = _generate_toc(groups_dict)
-    out.extend(toc)
+    buf.writelines(toc)
 
     # === CONVERSATIONS ===
-    all_sources: List[Tuple[str, str]] = []
+    # Message texts, scanned for sources in one pass once all are written
+    source_texts: List[str] = []
 
     for conv_num, (_, items) in enumerate(group_order, start=1):
         root_item = items[0]
@@ -107,50 +119,114 @@ def _build_clean_txt(
         root_msgs = root_item["msgs"]
 
         # Section header (clean, no technical IDs unless needed for reference)
-        out.append(f"\n{'='*70}\n")
-        out.append(f"{conv_num}. {root_title}\n")
-        out.append(f"{'='*70}\n\n")
+        w(f"\n{'='*70}\n")
+        w(f"{conv_num}. {root_title}\n")
+        w(f"{'='*70}\n\n")
 
         # Root conversation messages
         if root_msgs:
             for msg in root_msgs:
                 role = msg.role.capitalize()
-                out.append(f"{role}:\n\n{msg.text}\n\n")
-                # extract sources incrementally
-                all_sources.extend(_extract_sources(msg.text))
+                w(f"{role}:\n\n{msg.text}\n\n")
+                source_texts.append(msg.text)
         else:
-            out.append("[No messages in root conversation.]\n\n")
+            w("[No messages in root conversation.]\n\n")
 
         # Branches
         for branch_idx, branch_item in enumerate(items[1:], start=1):
             branch_title = branch_item["title"] or "Untitled"
             branch_msgs = branch_item["msgs"]
 
-            out.append(f"\n--- Branch {branch_idx}: {branch_title} ---\n\n")
+            w(f"\n--- Branch {branch_idx}: {branch_title} ---\n\n")
 
             if branch_msgs:
                 for msg in branch_msgs:
                     role = msg.role.capitalize()
-                    out.append(f"{role}:\n\n{msg.text}\n\n")
-                    all_sources.extend(_extract_sources(msg.text))
+                    w(f"{role}:\n\n{msg.text}\n\n")
+                    source_texts.append(msg.text)
             else:
-                out.append("[No new messages in this branch.]\n\n")
+                w("[No new messages in this branch.]\n\n")
 
     # === SOURCES REGISTRY ===
+    # URLs stop at whitespace, so none can span the "\n" between two texts.
+    all_sources = dict(_extract_sources("\n".join(source_texts)))
     if all_sources:
-        # Deduplicate and sort
-        sources_dict: Dict[str, str] = {}
-        for url, label in all_sources:
-            if url not in sources_dict:
-                sources_dict[url] = label
-
-        out.append(f"\n{'='*70}\n")
-        out.append("SOURCES REGISTRY\n")
-        out.append(f"{'='*70}\n\n")
-        for i, (url, label) in enumerate(sorted(sources_dict.items()), start=1):
-            out.append(f"[{i}] {label}\n    {url}\n\n")
-
-    return "".join(out)
+        w(f"\n{'='*70}\n")
+        w("SOURCES REGISTRY\n")
+        w(f"{'='*70}\n\n")
+        for i, (url, label) in enumerate(sorted(all_sources.items()), start=1):
+            w(f"[{i}] {label}\n    {url}\n\n")
+
+    return buf.getvalue()
+
+
+# Keywords for identifying candidates (generic research-relevant terms)
+_CANDIDATE_KEYWORDS = (
+    "research",
+    "analysis",
+    "report",
+    "study",
+    "project",
+    "draft",
+    "document",
+    "paper",
+    "article",
+    "summary",
+)
+
+_LEGAL_KEYWORDS = (
+    ".gov.br",
+    ".senado",
+    ".camara",
+    "judicial",
+    "legal",
+    "court",
+    "law",
+)
+_MEDIA_KEYWORDS = (
+    "news",
+    "folha",
+    "globo",
+    "estadao",
+    "uol",
+    "bbc",
+    "cnn",
+    "press",
+    "media",
+    "jornalismo",
+    "nytimes",
+    "wsj",
+    "reuters",
+)
+_ECONOMIC_KEYWORDS = (
+    "economic",
+    "financial",
+    "trade",
+    "economy",
+    "banco",
+    "bcb",
+    "imf",
+    "world bank",
+    "commerce",
+    "bloomberg",
+    "forbes",
+)
+_INTERNAL_KEYWORDS = ("note", "transcript", "internal", "memo", "meeting", "summary")
+
+
+def _keyword_pattern(keywords: Tuple[str, ...]) -> "re.Pattern[str]":
+    """One alternation matching any keyword as a plain (lowercase) substring."""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+_RE_CANDIDATE_SOURCE = _keyword_pattern(_CANDIDATE_KEYWORDS)
+# Domain categories in priority order; the first match wins.
+_SOURCE_CATEGORY_PATTERNS = (
+    ("legal", _keyword_pattern(_LEGAL_KEYWORDS)),
+    ("media", _keyword_pattern(_MEDIA_KEYWORDS)),
+    ("economic", _keyword_pattern(_ECONOMIC_KEYWORDS)),
+    ("internal", _keyword_pattern(_INTERNAL_KEYWORDS)),
+)
 
 
 def _tag_sources(
@@ -177,110 +253,48 @@ def _tag_sources(
         "other": [],
     }
 
-    # Keywords for identifying candidates (generic research-relevant terms)
-    candidate_keywords = [
-        "research",
-        "analysis",
-        "report",
-        "study",
-        "project",
-        "draft",
-        "document",
-        "paper",
-        "article",
-        "summary",
-    ]
-
-    legal_keywords = [
-        ".gov.br",
-        ".senado",
-        ".camara",
-        "judicial",
-        "legal",
-        "court",
-        "law",
-    ]
-    media_keywords = [
-        "news",
-        "folha",
-        "globo",
-        "estadao",
-        "uol",
-        "bbc",
-        "cnn",
-        "press",
-        "media",
-        "jornalismo",
-        "nytimes",
-        "wsj",
-        "reuters",
-    ]
-    economic_keywords = [
-        "economic",
-        "financial",
-        "trade",
-        "economy",
-        "banco",
-        "bcb",
-        "imf",
-        "world bank",
-        "commerce",
-        "bloomberg",
-        "forbes",
-    ]
-    internal_keywords = ["note", "transcript", "internal", "memo", "meeting", "summary"]
-
     for url, label in sources:
-        url_lower = url.lower()
-        label_lower = label.lower()
-
         # First priority: check if in used_links
         if used_links and url in used_links:
             categories["used_in_drafts"].append((url, label))
             continue
 
+        # Keywords may match in either the URL or the label; the NUL separator
+        # keeps a match from spanning both.
+        haystack = f"{url.lower()}\0{label.lower()}"
+
         # Second priority: check if candidate for next column
-        if any(kw in url_lower or kw in label_lower for kw in candidate_keywords):
+        if _RE_CANDIDATE_SOURCE.search(haystack):
             categories["candidate"].append((url, label))
             continue
 
-        # Then categorize by domain
-        categorized = False
-        if any(kw in url_lower or kw in label_lower for kw in legal_keywords):
-            categories["legal"].append((url, label))
-            categorized = True
-        elif any(kw in url_lower or kw in label_lower for kw in media_keywords):
-            categories["media"].append((url, label))
-            categorized = True
-        elif any(kw in url_lower or kw in label_lower for kw in economic_keywords):
-            categories["economic"].append((url, label))
-            categorized = True
-        elif any(kw in url_lower or kw in label_lower for kw in internal_keywords):
-            categories["internal"].append((url, label))
-            categorized = True
-
-        # Default to other
-        if not categorized:
+        # Then categorize by domain, defaulting to other
+        for category, pattern in _SOURCE_CATEGORY_PATTERNS:
+            if pattern.search(haystack):
+                categories[category].append((url, label))
+                break
+        else:
             categories["other"].append((url, label))
 
     return categories
 
 
+_RE_SOURCES_SECTION = re.compile(
+    r"^={70}\nSOURCES REGISTRY\n={70}\n\n(.+)$", re.MULTILINE | re.DOTALL
+)
+_RE_SOURCE_ENTRY = re.compile(r"\[(\d+)\]\s+(.+?)\n\s+(https?://\S+)")
+
+
 def _reorganize_sources_section(
     text: str, used_links: Optional[Set[str]] = None
 ) -> str:
     """Extract sources from text and reorganize them by category."""
-    sources_match = re.search(
-        r"^={70}\nSOURCES REGISTRY\n={70}\n\n(.+)$",
-        text,
-        flags=re.MULTILINE | re.DOTALL,
-    )
+    sources_match = _RE_SOURCES_SECTION.search(text)
     if not sources_match:
         return text
 
     sources: List[Tuple[str, str]] = []
-    source_pattern = r"\[(\d+)\]\s+(.+?)\n\s+(https?://\S+)"
-    for match in re.finditer(source_pattern, sources_match.group(1)):
+    for match in _RE_SOURCE_ENTRY.finditer(sources_match.group(1)):
         label, url = match.group(2).strip(), match.group(3).strip()
         sources.append((url, label))
 
@@ -1,19 +1,78 @@
 import sqlite3
 import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import suppress
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Sized, Tuple
 
+from cgpt.core.constants import INDEX_WORKERS
 from cgpt.core.io import coerce_create_time
 from cgpt.domain.conversations import (
     conv_id_and_title,
-    extract_messages_best_effort,
-    find_conversations_json,
-    load_json,
+    conversation_text,
+    find_conversations_payload,
     normalize_conversations,
 )
 
+_INDEX_BATCH_SIZE = 1000
+_PROGRESS_STRIDE = 128
+# Bump when the on-disk layout changes; older DBs are rebuilt on next index.
+_INDEX_SCHEMA_VERSION = "3"
+# The trigram tokenizer matches substrings, but only of at least this many
+# characters; shorter phrases never match.
+_TRIGRAM_MIN_CHARS = 3
+
+_SEARCH_SQL = (
+    "SELECT m.id, m.title FROM conv_search "
+    "JOIN conv_meta m ON m.rowid = conv_search.rowid "
+    "WHERE {} MATCH ? ORDER BY conv_search.rowid"
+)
+# One statement text per `where`, so sqlite3's statement cache can reuse them.
+_SEARCH_QUERIES = {
+    "title": _SEARCH_SQL.format("conv_search.title"),
+    "messages": _SEARCH_SQL.format("conv_search.content"),
+    "all": _SEARCH_SQL.format("conv_search"),
+}
+_READ_MMAP_BYTES = 256 * 1024 * 1024
+# index_meta keys identifying the export JSON the rows were built from.
+_SOURCE_META_KEYS = ("source", "source_mtime_ns", "source_size")
+
+# Read-only connection shared by index lookups in this process, keyed by DB path.
+_read_conn: Optional[Tuple[str, sqlite3.Connection]] = None
+_read_lock = threading.Lock()
+
+def _create_search_table(cur: sqlite3.Cursor) -> str:
+    """Create conv_search, linked to conv_meta by rowid; return its tokenizer.
+
+    Prefer the trigram tokenizer (SQLite 3.34+): it matches substrings, like
+    the JSON scan `search` falls back to, so its answers are final. Builds
+    without it get the word-based unicode61 default. Each tokenizer prefers a
+    contentless table so titles/content are not stored a second time inside
+    the FTS index; row deletes on contentless tables need SQLite 3.43+, so
+    older builds fall back to a regular FTS5 table with the same columns.
+    """
+    for tokenizer, tokenize_opt in (("trigram", ", tokenize='trigram'"), ("unicode61", "")):
+        try:
+            cur.execute(
+                "CREATE VIRTUAL TABLE conv_search USING fts5(title, content, "
+                f"content='', contentless_delete=1{tokenize_opt})"
+            )
+            return tokenizer
+        except sqlite3.OperationalError:
+            pass
+        try:
+            cur.execute(
+                f"CREATE VIRTUAL TABLE conv_search USING fts5(title, content{tokenize_opt})"
+            )
+            return tokenizer
+        except sqlite3.OperationalError:
+            if not tokenize_opt:
+                raise
+    raise sqlite3.OperationalError("fts5 unavailable")
+
 
 def _init_index(db_path: Path) -> None:
     conn = sqlite3.connect(str(db_path))
@@ -25,21 +84,157 @@ def _init_index(db_path: Path) -> None:
         cur.execute(
             "CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value TEXT)"
         )
-        try:
-            cur.execute(
-                "CREATE VIRTUAL TABLE IF NOT EXISTS conv_search USING fts5(title, content, cid UNINDEXED)"
-            )
-        except sqlite3.OperationalError:
-            # FTS5 not available in this sqlite build
-            print(
-                "WARNING: SQLite FTS5 not available; full-text index disabled",
-                file=sys.stderr,
-            )
+        if _get_index_meta(cur, "schema") != _INDEX_SCHEMA_VERSION:
+            # Older layouts linked FTS rows through a `cid` column; rebuild.
+            # This reset commits before the rebuild's own transaction, so drop
+            # the root scope too: until a rebuild commits, the emptied index
+            # must not pass `index_matches_root`.
+            cur.execute("DROP TABLE IF EXISTS conv_search")
+            cur.execute("DELETE FROM conv_meta")
+            cur.execute("DELETE FROM index_meta")
+            _set_index_meta(cur, "schema", _INDEX_SCHEMA_VERSION)
+        if not _table_exists(cur, "conv_search"):
+            try:
+                _set_index_meta(cur, "tokenizer", _create_search_table(cur))
+            except sqlite3.OperationalError:
+                # FTS5 not available in this sqlite build
+                print(
+                    "WARNING: SQLite FTS5 not available; full-text index disabled",
+                    file=sys.stderr,
+                )
         conn.commit()
     finally:
         conn.close()
 
 
+def _apply_bulk_write_pragmas(conn: sqlite3.Connection) -> None:
+    """Tune the connection for one large write transaction.
+
+    WAL + synchronous=NORMAL keeps the DB consistent on crash while avoiding an
+    fsync per statement; temp/cache settings keep FTS merges in memory.
+    """
+    for pragma in (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-200000",
+    ):
+        with suppress(sqlite3.Error):
+            conn.execute(pragma)
+
+
+def _table_exists(cur: sqlite3.Cursor, name: str) -> bool:
+    row = cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = ? LIMIT 1", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def _table_has_rows(cur: sqlite3.Cursor, name: str) -> bool:
+    try:
+        return cur.execute(f"SELECT 1 FROM {name} LIMIT 1").fetchone() is not None
+    except sqlite3.Error:
+        return False
+
+
+def _write_index_rows(
+    cur: sqlite3.Cursor,
+    rows: List[Tuple[Any, str, float, str]],
+    *,
+    fts_enabled: bool,
+    replace_fts: bool,
+) -> None:
+    if fts_enabled and replace_fts:
+        # keep conv_search in sync: remove prior entries for these cids in one
+        # pass, before REPLACE assigns their conv_meta rows new rowids
+        cur.execute("CREATE TEMP TABLE IF NOT EXISTS pending_cids (cid)")
+        cur.execute("DELETE FROM pending_cids")
+        cur.executemany(
+            "INSERT INTO pending_cids (cid) VALUES (?)", [(r[0],) for r in rows]
+        )
+        cur.execute(
+            "DELETE FROM conv_search WHERE rowid IN ("
+            "SELECT m.rowid FROM conv_meta m JOIN pending_cids p ON p.cid = m.id)"
+        )
+    cur.executemany(
+        "REPLACE INTO conv_meta (id, title, create_time) VALUES (?, ?, ?)",
+        [(cid, title, ctime) for cid, title, ctime, _ in rows],
+    )
+    if not fts_enabled:
+        return
+    cur.executemany(
+        "INSERT INTO conv_search (rowid, title, content) "
+        "SELECT rowid, ?, ? FROM conv_meta WHERE id = ?",
+        [(title, content, cid) for cid, title, _, content in rows],
+    )
+
+
+def _write_index_batch(
+    cur: sqlite3.Cursor,
+    rows: List[Tuple[Any, str, float, str]],
+    *,
+    fts_enabled: bool,
+    replace_fts: bool,
+) -> int:
+    """Write staged rows with executemany; return how many were written.
+
+    If the batch fails, retry row by row and skip problematic conversations.
+    """
+    if not rows:
+        return 0
+    cur.execute("SAVEPOINT index_batch")
+    try:
+        _write_index_rows(cur, rows, fts_enabled=fts_enabled, replace_fts=replace_fts)
+    except sqlite3.Error:
+        cur.execute("ROLLBACK TO index_batch")
+    else:
+        cur.execute("RELEASE index_batch")
+        return len(rows)
+    cur.execute("RELEASE index_batch")
+
+    written = 0
+    for row in rows:
+        try:
+            _write_index_rows(
+                cur, [row], fts_enabled=fts_enabled, replace_fts=replace_fts
+            )
+        except sqlite3.Error:
+            continue
+        written += 1
+    return written
+
+
+def _prep_index_row(c: Dict[str, Any]) -> Optional[Tuple[Any, str, float, str]]:
+    """Return the (cid, title, create_time, content) row indexed for `c`."""
+    cid, title = conv_id_and_title(c)
+    if not cid:
+        return None
+    ctime = coerce_create_time(c.get("create_time"))
+    return cid, title, ctime, conversation_text(c)
+
+
+def _iter_index_rows(
+    convs: Iterable[Dict[str, Any]], workers: int
+) -> Iterator[Optional[Tuple[Any, str, float, str]]]:
+    """Yield `_prep_index_row` results in input order.
+
+    With `workers > 1`, extraction runs in a process pool. Conversations are
+    submitted in bounded slices so streamed exports are never fully buffered.
+    Shipping each conversation to a worker costs roughly as much as extracting
+    it, so this only pays off for very large exports on many-core machines.
+    """
+    if workers <= 1:
+        yield from map(_prep_index_row, convs)
+        return
+    it = iter(convs)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        while True:
+            chunk = list(islice(it, _INDEX_BATCH_SIZE * workers))
+            if not chunk:
+                return
+            yield from ex.map(_prep_index_row, chunk, chunksize=64)
+
+
 def _root_scope_key(root: Path) -> str:
     try:
         return str(root.resolve())
@@ -47,6 +242,20 @@ def _root_scope_key(root: Path) -> str:
         return str(root)
 
 
+def _source_stamp(data_file: Path) -> Optional[Tuple[str, str, str]]:
+    """Return (path, st_mtime_ns, st_size) for `data_file`, or None if it can't be read.
+
+    Rewriting the export JSON changes its mtime (and usually its size), so a
+    matching stamp means the indexed rows still describe the file.
+    """
+    try:
+        st = data_file.stat()
+        path = str(data_file.resolve())
+    except (OSError, RuntimeError):
+        return None
+    return path, str(st.st_mtime_ns), str(st.st_size)
+
+
 def _get_index_meta(cur: sqlite3.Cursor, key: str) -> Optional[str]:
     try:
         row = cur.execute("SELECT value FROM index_meta WHERE key = ?", (key,)).fetchone()
@@ -72,43 +281,82 @@ def _clear_index_rows(cur: sqlite3.Cursor) -> None:
         cur.execute("DELETE FROM conv_search")
 
 
+def _read_connection(db_path: Path) -> sqlite3.Connection:
+    """Return the shared read-only connection for `db_path`, opening it once.
+
+    Callers must hold `_read_lock`. Reads go through mmap instead of read().
+    """
+    global _read_conn
+    key = str(db_path)
+    if _read_conn is not None:
+        if _read_conn[0] == key:
+            return _read_conn[1]
+        _read_conn[1].close()
+        _read_conn = None
+    conn = sqlite3.connect(key, check_same_thread=False)
+    with suppress(sqlite3.Error):
+        conn.execute("PRAGMA query_only=1")
+        conn.execute(f"PRAGMA mmap_size={_READ_MMAP_BYTES}")
+    _read_conn = (key, conn)
+    return conn
+
 def index_matches_root(db_path: Path, root: Path) -> bool:
-    """Return True only when index metadata confirms this DB was built for `root`."""
+    """Return True only when index metadata confirms this DB was built for `root`.
+
+    The export JSON recorded at index time must also be unchanged (same path,
+    mtime and size); otherwise callers fall back to scanning the JSON.
+    """
     if not db_path.exists():
         return False
-    conn = sqlite3.connect(str(db_path))
-    try:
-        cur = conn.cursor()
-        indexed_root = _get_index_meta(cur, "root")
-        if indexed_root is None:
+    with _read_lock:
+        try:
+            cur = _read_connection(db_path).cursor()
+            if _get_index_meta(cur, "schema") != _INDEX_SCHEMA_VERSION:
+                return False
+            indexed_root = _get_index_meta(cur, "root")
+            if indexed_root is None or indexed_root != _root_scope_key(root):
+                return False
+            stamp = tuple(_get_index_meta(cur, key) for key in _SOURCE_META_KEYS)
+        except sqlite3.Error:
             return False
-        return indexed_root == _root_scope_key(root)
-    except sqlite3.Error:
+    if stamp[0] is None:
         return False
-    finally:
-        conn.close()
+    return _source_stamp(Path(stamp[0])) == stamp
 
 def index_export(
-    root: Path, db_path: Path, reindex: bool = False, show_progress: bool = True
+    root: Path,
+    db_path: Path,
+    reindex: bool = False,
+    show_progress: bool = True,
+    convs: Optional[Iterable[Dict[str, Any]]] = None,
+    data_file: Optional[Path] = None,
 ) -> Optional[int]:
     """Index conversations under `root` into `db_path`.
 
     If `reindex` is True the existing indexed rows will be cleared first.
-    This is a lightweight, best-effort implementation intended to make searches
-    faster for typical-sized exports.
+    Callers that already hold the export's conversations can pass them as
+    `convs` to skip discovery and parsing, with the JSON file they came from
+    as `data_file`. Its mtime and size are recorded so lookups can tell when
+    it changes; without one, `index_matches_root` never trusts the index.
+    This is a lightweight, best-effort implementation intended to make
+    searches faster for typical-sized exports.
     """
-    data_file = find_conversations_json(root)
-    if not data_file:
-        return None
-    data = load_json(data_file)
-    convs = normalize_conversations(data)
+    if convs is None:
+        found = find_conversations_payload(root)
+        if not found:
+            return None
+        data_file = found[0]
+        convs = normalize_conversations(found[1])
+    source = _source_stamp(data_file) if data_file is not None else None
 
     db_path.parent.mkdir(parents=True, exist_ok=True)
     _init_index(db_path)
-    conn = sqlite3.connect(str(db_path))
+    # Autocommit mode: the whole rebuild runs in one explicit transaction below.
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
     try:
+        _apply_bulk_write_pragmas(conn)
         cur = conn.cursor()
-        conn.execute("BEGIN")
+        cur.execute("BEGIN IMMEDIATE")
         root_key = _root_scope_key(root)
         indexed_root = _get_index_meta(cur, "root")
         scope_changed = indexed_root is not None and indexed_root != root_key
@@ -122,10 +370,25 @@ def index_export(
             except sqlite3.Error:
                 legacy_without_scope = False
 
-        if reindex or scope_changed or legacy_without_scope:
+        cleared = reindex or scope_changed or legacy_without_scope
+        if cleared:
             _clear_index_rows(cur)
         _set_index_meta(cur, "root", root_key)
-        total = len(convs)
+        if source is not None:
+            for key, value in zip(_SOURCE_META_KEYS, source):
+                _set_index_meta(cur, key, value)
+        else:
+            cur.execute(
+                "DELETE FROM index_meta WHERE key IN (?, ?, ?)", _SOURCE_META_KEYS
+            )
+        fts_enabled = _table_exists(cur, "conv_search")
+        # Prior FTS rows only need replacing when the index already had rows.
+        replace_fts = fts_enabled and not cleared and _table_has_rows(cur, "conv_meta")
+        flushed_ids: Set[Any] = set()
+        batch: Dict[Any, Tuple[Any, str, float, str]] = {}
+        indexed = 0
+        # Streamed exports have no known length; show throughput instead of ETA.
+        total = len(convs) if isinstance(convs, Sized) else None
         i = 0
         start = time.time()
         last_update = start
@@ -140,91 +403,129 @@ def index_export(
                 return f"{h}:{m:02d}:{sec:02d}"
             return f"{m:02d}:{sec:02d}"
 
-        for c in convs:
-            cid, title = conv_id_and_title(c)
-            if not cid:
+        def _flush() -> int:
+            rows = list(batch.values())
+            batch.clear()
+            needs_delete = replace_fts or any(r[0] in flushed_ids for r in rows)
+            written = _write_index_batch(
+                cur, rows, fts_enabled=fts_enabled, replace_fts=needs_delete
+            )
+            flushed_ids.update(r[0] for r in rows)
+            return written
+
+        for row in _iter_index_rows(convs, INDEX_WORKERS):
+            if row is None:
                 continue
-            ctime = coerce_create_time(c.get("create_time"))
-            msgs = extract_messages_best_effort(c)
-            content = "\n".join(m.text for m in msgs)
+            cid = row[0]
             try:
-                cur.execute(
-                    "REPLACE INTO conv_meta (id, title, create_time) VALUES (?, ?, ?)",
-                    (cid, title, ctime),
-                )
-                # keep conv_search in sync: remove any prior entries for this cid
-                try:
-                    cur.execute("DELETE FROM conv_search WHERE cid = ?", (cid,))
-                    cur.execute(
-                        "INSERT INTO conv_search (title, content, cid) VALUES (?, ?, ?)",
-                        (title, content, cid),
-                    )
-                except sqlite3.OperationalError:
-                    # FTS table not available; ignore silently
-                    pass
-            except Exception:
-                # best-effort: skip problematic conversations
+                # Later duplicates of a cid replace earlier ones, as REPLACE did.
+                batch.pop(cid, None)
+                batch[cid] = row
+            except TypeError:
+                # best-effort: skip conversations with unhashable ids
                 continue
+            if len(batch) >= _INDEX_BATCH_SIZE:
+                indexed += _flush()
             i += 1
-            if show_progress:
+            # Only read the clock every _PROGRESS_STRIDE items; the display
+            # still updates at most every 0.25s, and always on the final item.
+            if show_progress and (i % _PROGRESS_STRIDE == 0 or i == total):
                 now = time.time()
-                # update display at most every 0.25s, or on final item
                 if i == total or (now - last_update >= 0.25):
                     elapsed = now - start if now > start else 0.0
                     rate = (i / elapsed) if elapsed > 0 else None
-                    if rate and rate > 0:
-                        rem = total - i
-                        eta = rem / rate
-                        eta_str = _fmt_eta(eta)
-                    else:
-                        eta_str = "--:--"
                     spin = spinner[spin_idx % len(spinner)]
+                    if total is None:
+                        rate_str = f"{rate:.0f}/s" if rate else "--/s"
+                        status = f"Indexed {i} {spin} {rate_str}"
+                    else:
+                        if rate and rate > 0:
+                            rem = total - i
+                            eta = rem / rate
+                            eta_str = _fmt_eta(eta)
+                        else:
+                            eta_str = "--:--"
+                        status = f"Indexed {i}/{total} {spin} ETA: {eta_str}"
                     spin_idx += 1
                     last_update = now
                     # carriage-return line to update progress in-place
                     print(
-                        f"\rIndexed {i}/{total} {spin} ETA: {eta_str}",
+                        f"\r{status}",
                         end="",
                         file=sys.stderr,
                         flush=True,
                     )
+        indexed += _flush()
+        if fts_enabled and not replace_fts:
+            # Bulk build from empty: merge FTS segments once at the end.
+            with suppress(sqlite3.Error):
+                cur.execute("INSERT INTO conv_search (conv_search) VALUES ('optimize')")
         if show_progress:
             # finish line
             print("", file=sys.stderr)
-        conn.commit()
+        cur.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
     finally:
         conn.close()
-    return i
+    return indexed
+
+def _run_index_query(
+    db_path: Path, q: str, where: str
+) -> Optional[List[Tuple[str, str]]]:
+    """Run an FTS query; return (cid, title) rows, or None if it failed."""
+    if not db_path.exists():
+        return None
+    sql = _SEARCH_QUERIES.get(where, _SEARCH_QUERIES["all"])
+    with _read_lock:
+        try:
+            rows = _read_connection(db_path).execute(sql, (q,)).fetchall()
+            return [(r[0], r[1]) for r in rows]
+        except sqlite3.OperationalError:
+            return None
 
 def query_index(db_path: Path, q: str, where: str = "all") -> List[Tuple[str, str]]:
     """Query the index and return list of (cid, title).
 
     Falls back to empty list on any error.
     """
-    if not db_path.exists():
-        return []
-    conn = sqlite3.connect(str(db_path))
-    try:
-        cur = conn.cursor()
+    return _run_index_query(db_path, q, where) or []
+
+def search_index(
+    db_path: Path,
+    terms: List[str],
+    and_terms: bool,
+    where: str = "all",
+    *,
+    exact: bool = False,
+) -> Optional[List[Tuple[str, str]]]:
+    """Answer a `search` from the index, or return None to defer to the JSON scan.
+
+    On a trigram index every phrase is a case-insensitive substring query,
+    the same test the JSON scan applies, so the rows are final even when
+    there are none. Terms shorter than a trigram can't be answered there, so
+    those searches are deferred entirely. A unicode61 index matches whole
+    words only; its rows are used when there are some, as before, and an
+    empty result is deferred. With `exact`, unicode61 results are always
+    deferred, since they can miss substring matches.
+    """
+    fts_q = build_fts_query(terms, and_terms)
+    if not fts_q:
+        return None
+    with _read_lock:
         try:
-            if where == "title":
-                cur.execute(
-                    "SELECT cid, title FROM conv_search WHERE title MATCH ?", (q,)
-                )
-            elif where == "messages":
-                cur.execute(
-                    "SELECT cid, title FROM conv_search WHERE content MATCH ?", (q,)
-                )
-            else:
-                cur.execute(
-                    "SELECT cid, title FROM conv_search WHERE conv_search MATCH ?", (q,)
-                )
-            rows = cur.fetchall()
-            return [(r[0], r[1]) for r in rows]
-        except sqlite3.OperationalError:
-            return []
-    finally:
-        conn.close()
+            tokenizer = _get_index_meta(_read_connection(db_path).cursor(), "tokenizer")
+        except sqlite3.Error:
+            return None
+    if tokenizer == "trigram":
+        if any(len(t) < _TRIGRAM_MIN_CHARS for t in terms if t):
+            return None
+        return _run_index_query(db_path, fts_q, where)
+    if exact:
+        return None
+    return _run_index_query(db_path, fts_q, where) or None
 
 def build_fts_query(terms: List[str], and_terms: bool) -> str:
     """Build a simple FTS5 MATCH query from terms.
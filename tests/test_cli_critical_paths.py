@@ -1,6 +1,7 @@
 import importlib.util
 import json
 import os
+import sqlite3
 import subprocess
 import sys
 import tempfile
@@ -15,6 +16,20 @@ CGPT = REPO_ROOT / "cgpt.py"
 HAS_DOCX = importlib.util.find_spec("docx") is not None
 
 
+def _sqlite_has_trigram() -> bool:
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE t USING fts5(x, tokenize='trigram')")
+        return True
+    except sqlite3.Error:
+        return False
+    finally:
+        conn.close()
+
+
+HAS_TRIGRAM = _sqlite_has_trigram()
+
+
 def _conv(cid: str, title: str, create_time: float, user_text: str, assistant_text: str):
     return {
         "id": cid,
@@ -95,6 +110,26 @@ class TestCliCriticalPaths(unittest.TestCase):
         os.utime(zpath, (mtime, mtime))
         return zpath
 
+    def _rewrite_export_keeping_stamp(self, text: str) -> None:
+        # Same size and mtime: an index built from the file still counts as current.
+        convs_path = self.root / "conversations.json"
+        st = convs_path.stat()
+        data = text.encode("utf-8")
+        self.assertEqual(len(data), st.st_size)
+        convs_path.write_bytes(data)
+        os.utime(convs_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    def _redacted_export(self) -> str:
+        # Message text replaced by same-length filler, so matches can only come from the index.
+        conversations = json.loads(
+            (self.root / "conversations.json").read_text(encoding="utf-8")
+        )
+        for conv in conversations:
+            for node in conv["mapping"].values():
+                parts = node["message"]["content"]["parts"]
+                parts[:] = ["x" * len(part) for part in parts]
+        return json.dumps(conversations)
+
     @staticmethod
     def _stdout_ids(stdout: str) -> List[str]:
         ids = []
@@ -146,6 +181,9 @@ class TestCliCriticalPaths(unittest.TestCase):
         )
 
         self.assertEqual(result.returncode, 0, msg=result.stderr)
+        # Piped selections skip the numbered preview; the TSV still records it.
+        self.assertNotIn("\tAlpha planning\t", result.stdout)
+        self.assertIn("Saved full match list to:", result.stdout)
 
         selected_file = self.dossiers / "selected_ids__Alpha.txt"
         self.assertTrue(selected_file.exists())
@@ -313,6 +351,38 @@ class TestCliCriticalPaths(unittest.TestCase):
         self.assertFalse(list(self.dossiers.glob("*.docx")))
         self.assertFalse(list(self.dossiers.glob("*.txt")))
 
+    def test_build_dossier_with_worker_pool_matches_serial_markdown(self):
+        outputs = {}
+        for name, workers in (("serial", "1"), ("pooled", "2")):
+            result = self.run_cgpt(
+                "build-dossier",
+                "--root",
+                str(self.root),
+                "--ids",
+                "conv-a",
+                "conv-b",
+                "conv-c",
+                "--mode",
+                "full",
+                "--format",
+                "md",
+                "--no-split",
+                "--name",
+                name,
+                env={"CGPT_DOSSIER_WORKERS": workers},
+            )
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            md_files = list((self.dossiers / name).glob("*.md"))
+            self.assertEqual(len(md_files), 1)
+            outputs[name] = [
+                line
+                for line in md_files[0].read_text(encoding="utf-8").splitlines()
+                if not line.startswith("- generated_at:")
+            ]
+
+        self.assertEqual(outputs["pooled"], outputs["serial"])
+        self.assertIn("## Thread: Alpha planning", outputs["pooled"])
+
     def test_quick_recent_window_filters_candidates_before_topic_match(self):
         result = self.run_cgpt(
             "quick",
@@ -387,6 +457,85 @@ class TestCliCriticalPaths(unittest.TestCase):
         ).resolve()
         self.assertEqual(indexed_path, db_path.resolve())
 
+    def test_index_with_worker_pool_matches_serial_search_results(self):
+        result = self.run_cgpt(
+            "index",
+            "--root",
+            str(self.root),
+            "--reindex",
+            env={"CGPT_INDEX_WORKERS": "2"},
+        )
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+        search_result = self.run_cgpt(
+            "search",
+            "--terms",
+            "sources",
+            "--where",
+            "messages",
+            "--root",
+            str(self.root),
+        )
+        self.assertEqual(search_result.returncode, 0, msg=search_result.stderr)
+        self.assertEqual(self._stdout_ids(search_result.stdout), ["conv-b"])
+
+    @unittest.skipUnless(HAS_TRIGRAM, "requires SQLite FTS5 trigram tokenizer")
+    def test_search_answers_substrings_from_trigram_index_without_json(self):
+        result = self.run_cgpt("index", "--root", str(self.root), "--reindex")
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        # Once indexed, the export JSON must not be needed for 3+ char terms.
+        size = (self.root / "conversations.json").stat().st_size
+        self._rewrite_export_keeping_stamp("x" * size)
+
+        substring_result = self.run_cgpt(
+            "search", "--terms", "OURCE", "--where", "messages", "--root", str(self.root)
+        )
+        self.assertEqual(substring_result.returncode, 0, msg=substring_result.stderr)
+        self.assertEqual(self._stdout_ids(substring_result.stdout), ["conv-b"])
+
+        miss_result = self.run_cgpt(
+            "search", "--terms", "nowhere", "--where", "all", "--root", str(self.root)
+        )
+        self.assertEqual(miss_result.returncode, 0, msg=miss_result.stderr)
+        self.assertEqual(self._stdout_ids(miss_result.stdout), [])
+
+        short_result = self.run_cgpt(
+            "search", "--terms", "al", "--root", str(self.root)
+        )
+        self.assertNotEqual(short_result.returncode, 0)
+
+    @unittest.skipUnless(HAS_TRIGRAM, "requires SQLite FTS5 trigram tokenizer")
+    def test_quick_matches_messages_from_trigram_index_until_export_changes(self):
+        result = self.run_cgpt("index", "--root", str(self.root), "--reindex")
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        redacted = self._redacted_export()
+        self._rewrite_export_keeping_stamp(redacted)
+        quick_args = (
+            "quick",
+            "OURCE",
+            "--where",
+            "messages",
+            "--all",
+            "--root",
+            str(self.root),
+            "--format",
+            "txt",
+        )
+
+        quick_result = self.run_cgpt(*quick_args)
+        self.assertEqual(quick_result.returncode, 0, msg=quick_result.stderr)
+        selected_file = self.dossiers / "selected_ids__OURCE.txt"
+        self.assertEqual(
+            selected_file.read_text(encoding="utf-8").strip().splitlines(),
+            ["conv-b"],
+        )
+
+        # A rewritten export no longer matches the index, so quick scans the JSON.
+        (self.root / "conversations.json").write_text(redacted + "\n", encoding="utf-8")
+        stale_result = self.run_cgpt(*quick_args)
+        self.assertNotEqual(stale_result.returncode, 0)
+        self.assertIn("No conversations matched", stale_result.stderr)
+
     def test_search_ignores_index_rows_from_other_root(self):
         other_root = self.extracted / "other_export"
         other_root.mkdir(parents=True, exist_ok=True)
@@ -571,6 +720,10 @@ class TestCliCriticalPaths(unittest.TestCase):
         )
         self.assertEqual(header_line_count, 1)
         self.assertGreaterEqual(working_txt.count("RESEARCH LOG & TOOL ARTIFACTS"), 2)
+        rule = "=" * 70
+        self.assertIn(
+            f"{rule}\nAPPENDIX: RESEARCH LOG & TOOL ARTIFACTS\n{rule}\n\n", working_txt
+        )
 
     def test_build_dossier_uses_active_project_when_name_omitted(self):
         init_result = self.run_cgpt("project", "init", "alpha-project")
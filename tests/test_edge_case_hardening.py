@@ -181,6 +181,67 @@ class TestZipSafety(EdgeCaseBase):
         self.assertIn("invalid zip file", result.stderr.lower())
         self.assertNotIn("traceback", result.stderr.lower())
 
+    def test_extract_with_worker_threads_matches_serial_tree(self):
+        zpath = self.zips / "threaded.zip"
+        members = {
+            "conversations.json": "[]\n",
+            "nested/deep/a.txt": "alpha" * 500,
+            "nested/b.txt": "beta",
+            "nested/./c.txt": "gamma",
+            "top.html": "<p>hi</p>",
+        }
+        with zipfile.ZipFile(zpath, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("empty_dir/", "")
+            for name, payload in members.items():
+                zf.writestr(name, payload)
+
+        result = self.run_cgpt(
+            "extract", str(zpath), "--no-index", env={"CGPT_EXTRACT_WORKERS": "3"}
+        )
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        out_dir = self.extracted / "threaded"
+        self.assertTrue((out_dir / "empty_dir").is_dir())
+        self.assertEqual(
+            (out_dir / "nested" / "deep" / "a.txt").read_text(encoding="utf-8"),
+            "alpha" * 500,
+        )
+        self.assertEqual((out_dir / "nested" / "c.txt").read_text(encoding="utf-8"), "gamma")
+        self.assertEqual(
+            sorted(p.relative_to(out_dir).as_posix() for p in out_dir.rglob("*")),
+            [
+                "conversations.json",
+                "empty_dir",
+                "nested",
+                "nested/b.txt",
+                "nested/c.txt",
+                "nested/deep",
+                "nested/deep/a.txt",
+                "top.html",
+            ],
+        )
+
+    def test_extract_with_worker_threads_keeps_serial_order_for_case_only_duplicates(self):
+        from cgpt.core.zip_safety import _extract_all
+
+        class RecordingZipFile(zipfile.ZipFile):
+            serial = False
+
+            def extractall(self, *args, **kwargs):
+                self.serial = True
+                super().extractall(*args, **kwargs)
+
+        zpath = self.zips / "case_duplicates.zip"
+        with zipfile.ZipFile(zpath, "w") as zf:
+            zf.writestr("Notes/Read.txt", "first")
+            zf.writestr("notes/read.TXT", "second")
+            zf.writestr("other.txt", "x")
+
+        out_dir = self.extracted / "case_duplicates"
+        with RecordingZipFile(zpath, "r") as zf:
+            _extract_all(zf, zpath, out_dir, workers=3)
+            self.assertTrue(zf.serial)
+
 
 class TestIndexErrorPolicy(EdgeCaseBase):
     def test_index_fails_when_root_is_missing(self):
@@ -351,6 +412,23 @@ class TestTimestampRobustness(EdgeCaseBase):
         self.assertEqual(result.returncode, 0, msg=result.stderr)
         self.assertNotIn("traceback", result.stderr.lower())
 
+    def test_recent_non_finite_create_time_warns_instead_of_crashing(self):
+        root = self.extracted / "non_finite_export"
+        self.write_conversations(
+            root,
+            [
+                _conv("conv-nan", "Alpha nan", "nan", "alpha text", "beta"),
+                _conv("conv-inf", "Alpha inf", "inf", "alpha text", "beta"),
+                _conv("conv-ok", "Alpha ok", time.time() - 3600, "alpha text", "beta"),
+            ],
+        )
+        result = self.run_cgpt("recent", "2", "--all", "--root", str(root), "--format", "txt")
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+        self.assertNotIn("traceback", result.stderr.lower())
+        self.assertIn("2 invalid create_time", result.stderr)
+        selected_file = self.dossiers / "selected_ids__recent_2.txt"
+        self.assertEqual(selected_file.read_text(encoding="utf-8").splitlines()[0], "conv-ok")
+
     def test_quick_days_invalid_create_time_excluded_by_cutoff(self):
         result = self.run_cgpt(
             "quick",
@@ -932,5 +1010,240 @@ class TestDateFormattingHelpers(unittest.TestCase):
         self.assertRegex(rendered, r"^\d{4}-\d{2}-\d{2}$")
 
 
+
+class TestAppendixHeaderGuard(unittest.TestCase):
+    def test_count_exact_lines_matches_splitlines_semantics(self):
+        from cgpt.domain.dossier_builder import _count_exact_lines
+
+        marker = "APPENDIX: RESEARCH LOG & TOOL ARTIFACTS"
+        samples = [
+            "",
+            marker,
+            f"  {marker}\t\n",
+            f"intro\r\n{marker}\r\nbody\n{marker}",
+            f"see {marker} above\n{marker}x",
+            f"a\x0c{marker}\u2028b\x1f{marker}\x1f",
+        ]
+        for text in samples:
+            expected = sum(1 for line in text.splitlines() if line.strip() == marker)
+            self.assertEqual(_count_exact_lines(text, marker), expected, msg=repr(text))
+
+class TestCleanerPassOrder(unittest.TestCase):
+    def test_tool_noise_keeps_line_joined_after_status_removal(self):
+        from cgpt.domain.dossier_cleaning import _strip_tool_noise
+
+        text = (
+            "abc Successfully created x\n"
+            "The file is too long and its contents have been truncated. yes\nnext"
+        )
+        self.assertEqual(
+            _strip_tool_noise(text),
+            "abc The file is too long and its contents have been truncated. yes\nnext",
+        )
+
+    def test_citation_bracket_sees_text_after_tag_removal(self):
+        from cgpt.domain.dossier_cleaning import _strip_citation_markers
+
+        self.assertEqual(
+            _strip_citation_markers("See [1]<citeturn0news1> and more text here"),
+            "See and more text here",
+        )
+
+    def test_markup_tag_pass_runs_before_later_passes(self):
+        from cgpt.domain.dossier_cleaning import _sanitize_openai_markup
+
+        # The tag must go first, so the private-use markers then bound " x ".
+        text = "\ue000 <a \ue000> x \ue000 tail"
+        self.assertEqual(_sanitize_openai_markup(text), "tail")
+
+class TestConversationMetaCache(unittest.TestCase):
+    def test_meta_matches_and_reuses_conv_id_and_title(self):
+        from cgpt.domain.conversations import ConversationFields, conv_id_and_title
+
+        conv = {"conversation_id": "c-1", "name": " Tabbed\ttitle\n"}
+        fields = ConversationFields()
+        meta = fields.meta(conv)
+        self.assertEqual(meta, conv_id_and_title(conv))
+        self.assertIs(fields.meta(conv), meta)
+        self.assertEqual(conv, {"conversation_id": "c-1", "name": " Tabbed\ttitle\n"})
+
+    def test_title_lower_is_scoped_to_one_memo(self):
+        from cgpt.domain.conversations import ConversationFields
+
+        conv = {"id": "c-2", "title": " Mixed\tCASE Title "}
+        fields = ConversationFields()
+        self.assertEqual(fields.title_lower(conv), "mixed case title")
+        conv["title"] = "Changed"
+        self.assertEqual(fields.title_lower(conv), "mixed case title")
+        self.assertEqual(ConversationFields().title_lower(conv), "changed")
+        self.assertEqual(set(conv), {"id", "title"})
+
+    def test_ctime_counts_invalid_values_on_every_call(self):
+        from cgpt.domain.conversations import ConversationFields
+
+        conv = {"id": "c-3", "create_time": "not-a-time"}
+        fields = ConversationFields()
+        invalid = [0]
+        self.assertEqual(fields.ctime(conv, invalid), 0.0)
+        self.assertEqual(fields.ctime(conv, invalid), 0.0)
+        self.assertEqual(invalid, [2])
+        self.assertEqual(fields.ctime({"create_time": "12.5"}), 12.5)
+        self.assertEqual(set(conv), {"id", "create_time"})
+
+    def test_conversation_map_reads_ids_through_given_memo(self):
+        from cgpt.domain.conversations import (
+            ConversationFields,
+            build_conversation_map_by_id,
+        )
+
+        convs = [{"id": "a", "title": "A"}, {"id": "b", "title": "B"}]
+        fields = ConversationFields()
+        by_id = build_conversation_map_by_id(convs, ["b"], fields)
+        self.assertEqual(by_id, {"b": convs[1]})
+        self.assertEqual(fields.meta(convs[0]), ("a", "A"))
+
+class TestJsonFileParsing(unittest.TestCase):
+    def test_load_json_loose_handles_empty_and_non_strict_files(self):
+        from cgpt.domain.conversations import load_json_loose
+
+        with tempfile.TemporaryDirectory() as tmp:
+            empty = Path(tmp) / "empty.json"
+            empty.write_bytes(b"")
+            self.assertIsNone(load_json_loose(empty))
+
+            non_strict = Path(tmp) / "nan.json"
+            non_strict.write_text('[{"id": "c-1", "score": NaN}]', encoding="utf-8")
+            data = load_json_loose(non_strict)
+            self.assertEqual(data[0]["id"], "c-1")
+            self.assertNotEqual(data[0]["score"], data[0]["score"])
+
+class TestTopicAlternation(unittest.TestCase):
+    def test_overlapping_topics_highlight_the_longest_match(self):
+        from cgpt.core.color import compile_title_highlighter, set_cli_color_override
+
+        set_cli_color_override(True)
+        try:
+            highlight = compile_title_highlighter(["data", "data set", "data"])
+            self.assertEqual(
+                highlight("New Data set"),
+                "\033[97mNew \033[31mData set\033[97m\033[0m",
+            )
+        finally:
+            set_cli_color_override(None)
+
+    def test_disabled_color_skips_the_highlight_pattern(self):
+        from cgpt.core.color import (
+            _plain_title,
+            compile_title_highlighter,
+            set_cli_color_override,
+        )
+
+        set_cli_color_override(False)
+        try:
+            self.assertIs(compile_title_highlighter(["data"]), _plain_title)
+        finally:
+            set_cli_color_override(None)
+
+    def test_blank_topics_never_match(self):
+        from cgpt.domain.conversations import compile_topic_pattern
+
+        self.assertIsNone(compile_topic_pattern(["", "  "]).search("anything"))
+
+    def test_topic_pattern_prefilter_keeps_ignorecase_matches(self):
+        from cgpt.domain.conversations import compile_topic_pattern
+
+        pattern = compile_topic_pattern(["Kit", "policy"])
+        self.assertIsNotNone(pattern.search("new POLICY draft"))
+        # re.IGNORECASE pairs "i" with the Turkish dotless/dotted i.
+        self.assertIsNotNone(pattern.search("a k\u0131t list"))
+        self.assertIsNotNone(pattern.search("\u212a\u0130T"))
+        self.assertIsNone(pattern.search("nothing relevant"))
+
+class TestSelectionIdsInclude(unittest.TestCase):
+    def test_ids_include_is_reread_after_the_file_changes(self):
+        from cgpt.commands.dossier_selection import _parse_selection_text
+
+        matches = [("conv-a", "A", 0.0), ("conv-b", "B", 0.0)]
+        with tempfile.TemporaryDirectory() as tmp:
+            ids_file = Path(tmp) / "ids.txt"
+            ids_file.write_text(" conv-b \n\n", encoding="utf-8")
+            picked, warnings = _parse_selection_text(
+                f"@{ids_file}", matches, allow_ids_file_include=True
+            )
+            self.assertEqual((picked, warnings), ([2], []))
+
+            ids_file.write_text("conv-a\nconv-b\n", encoding="utf-8")
+            picked, warnings = _parse_selection_text(
+                f"@{ids_file}", matches, allow_ids_file_include=True
+            )
+            self.assertEqual((picked, warnings), ([1, 2], []))
+
+class TestRequestedCommand(unittest.TestCase):
+    def test_skips_global_options_and_their_values(self):
+        from cgpt.cli.parser import requested_command
+
+        self.assertEqual(requested_command(["r", "5"]), "r")
+        self.assertEqual(requested_command(["--home", "quick", "--no-color", "q", "x"]), "q")
+        self.assertEqual(requested_command(["--ho", "/tmp/h", "recent"]), "recent")
+        self.assertEqual(requested_command(["--home=/tmp/h", "find", "x"]), "find")
+
+    def test_help_and_unknown_commands_need_the_full_parser(self):
+        from cgpt.cli.parser import build_parser, requested_command
+
+        self.assertIsNone(requested_command([]))
+        self.assertIsNone(requested_command(["--help", "quick"]))
+        self.assertIsNone(requested_command(["nope"]))
+        args = build_parser("quick").parse_args(["quick", "alpha", "--all"])
+        self.assertEqual((args.cmd, args.topics, args.all), ("quick", ["alpha"], True))
+
+class TestIndexSchemaReset(unittest.TestCase):
+    def test_interrupted_rebuild_after_schema_reset_is_not_trusted(self):
+        import sqlite3
+
+        from cgpt.domain.indexing import (
+            _root_scope_key,
+            index_export,
+            index_matches_root,
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "export"
+            root.mkdir()
+            data_file = root / "conversations.json"
+            convs = [{"id": "c-1", "title": "New", "create_time": 2.0}]
+            data_file.write_text(json.dumps(convs), encoding="utf-8")
+            db_path = Path(tmp) / "cgpt_index.db"
+            # An older-schema index, already scoped to this root.
+            conn = sqlite3.connect(str(db_path))
+            conn.execute("CREATE TABLE conv_meta (id TEXT PRIMARY KEY, title TEXT, create_time REAL)")
+            conn.execute("CREATE TABLE index_meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("INSERT INTO conv_meta VALUES ('c-1', 'Old', 1.0)")
+            conn.executemany(
+                "INSERT INTO index_meta VALUES (?, ?)",
+                [("schema", "2"), ("root", _root_scope_key(root))],
+            )
+            conn.commit()
+            conn.close()
+
+            def interrupted():
+                yield from convs
+                raise KeyboardInterrupt
+
+            with self.assertRaises(KeyboardInterrupt):
+                index_export(
+                    root,
+                    db_path,
+                    show_progress=False,
+                    convs=interrupted(),
+                    data_file=data_file,
+                )
+            self.assertFalse(index_matches_root(db_path, root))
+
+            indexed = index_export(
+                root, db_path, show_progress=False, convs=convs, data_file=data_file
+            )
+            self.assertEqual(indexed, 1)
+            self.assertTrue(index_matches_root(db_path, root))
+
 if __name__ == "__main__":
     unittest.main()